@@ -28,6 +28,7 @@ import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
 from atomic_data_manager import ops
+from atomic_data_manager import stats
 from atomic_data_manager import ui
 from atomic_data_manager.ui import inspect_ui
 from atomic_data_manager.updater import addon_updater_ops
@@ -50,12 +51,19 @@ bl_info = {
 # Atomic Data Manager Properties
 class ATOMIC_PG_main(bpy.types.PropertyGroup):
     # main panel toggle buttons
+    actions: bpy.props.BoolProperty(default=False)
+    armatures: bpy.props.BoolProperty(default=False)
+    brushes: bpy.props.BoolProperty(default=False)
     collections: bpy.props.BoolProperty(default=False)
+    curves: bpy.props.BoolProperty(default=False)
+    fonts: bpy.props.BoolProperty(default=False)
     images: bpy.props.BoolProperty(default=False)
     lights: bpy.props.BoolProperty(default=False)
     materials: bpy.props.BoolProperty(default=False)
+    meshes: bpy.props.BoolProperty(default=False)
     node_groups: bpy.props.BoolProperty(default=False)
     particles: bpy.props.BoolProperty(default=False)
+    sounds: bpy.props.BoolProperty(default=False)
     textures: bpy.props.BoolProperty(default=False)
     worlds: bpy.props.BoolProperty(default=False)
 
@@ -223,6 +231,7 @@ def register():
     bpy.types.Scene.atomic = bpy.props.PointerProperty(type=ATOMIC_PG_main)
 
     # atomic package registration
+    stats.register()
     ui.register()
     ops.register()
 
@@ -233,6 +242,7 @@ def unregister():
     addon_updater_ops.unregister()
 
     # atomic package unregistration
+    stats.unregister()
     ui.unregister()
     ops.unregister()
 
@@ -33,6 +33,13 @@ enable_missing_file_warning = True
 enable_support_me_popup = True
 include_fake_users = False
 enable_pie_menu_ui = True
+user_graph_backend = 'ATOMIC'
+exclude_prefixes = ""
+exclude_linked_data = False
+exclude_tagged_data = True
+missing_file_workers = 8
+missing_file_timeout = 2.0
+search_roots = ""
 
 # hidden atomic preferences
 pie_menu_type = "D"
@@ -27,6 +27,7 @@ from atomic_data_manager.ops import inspect_ops
 from atomic_data_manager.ops import direct_use_ops
 from atomic_data_manager.ops import missing_file_ops
 from atomic_data_manager.ops import support_me_ops
+from atomic_data_manager.ops.utils import restore
 
 
 def register():
@@ -35,6 +36,7 @@ def register():
     direct_use_ops.register()
     missing_file_ops.register()
     support_me_ops.register()
+    restore.register()
 
 
 def unregister():
@@ -42,4 +44,5 @@ def unregister():
     inspect_ops.unregister()
     direct_use_ops.unregister()
     missing_file_ops.unregister()
-    support_me_ops.unregister()
\ No newline at end of file
+    support_me_ops.unregister()
+    restore.unregister()
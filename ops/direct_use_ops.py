@@ -32,9 +32,11 @@ import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
 from atomic_data_manager import config
+from atomic_data_manager.stats import background
 from atomic_data_manager.stats import unused
 from atomic_data_manager.ops.utils import nuke
 from atomic_data_manager.ops.utils import clean
+from atomic_data_manager.ops.utils import remove
 from atomic_data_manager.ui.utils import ui_layouts
 
 
@@ -130,15 +132,19 @@ class ATOMIC_OT_nuke_all(bpy.types.Operator):
 
     def execute(self, context):
 
-        nuke.collections()
-        nuke.images()
-        nuke.lights()
-        nuke.materials()
-        nuke.node_groups()
-        nuke.particles()
-        nuke.textures()
-        nuke.worlds()
+        remove.reset()
+
+        with remove.batch():
+            nuke.collections()
+            nuke.images()
+            nuke.lights()
+            nuke.materials()
+            nuke.node_groups()
+            nuke.particles()
+            nuke.textures()
+            nuke.worlds()
 
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -152,82 +158,133 @@ class ATOMIC_OT_clean_all(bpy.types.Operator):
     bl_idname = "atomic.clean_all"
     bl_label = "Clean All"
 
+    unused_actions = []
+    unused_armatures = []
+    unused_brushes = []
     unused_collections = []
+    unused_curves = []
+    unused_fonts = []
     unused_images = []
     unused_lights = []
     unused_materials = []
+    unused_meshes = []
     unused_node_groups = []
     unused_particles = []
+    unused_sounds = []
     unused_textures = []
     unused_worlds = []
 
+    # the scan result that is shown in the dialog and cleaned on execute
+    scan_result = None
+
     def draw(self, context):
         layout = self.layout
 
         col = layout.column()
         col.label(text="Remove the following data-blocks?")
 
-        collections = sorted(unused.collections_deep())
+        ui_layouts.box_list(
+            layout=layout,
+            title="Actions",
+            items=self.unused_actions,
+            icon="ACTION"
+        )
+
+        ui_layouts.box_list(
+            layout=layout,
+            title="Armatures",
+            items=self.unused_armatures,
+            icon="ARMATURE_DATA"
+        )
+
+        ui_layouts.box_list(
+            layout=layout,
+            title="Brushes",
+            items=self.unused_brushes,
+            icon="BRUSH_DATA"
+        )
+
         ui_layouts.box_list(
             layout=layout,
             title="Collections",
-            items=collections,
+            items=self.unused_collections,
             icon="OUTLINER_OB_GROUP_INSTANCE"
         )
 
-        images = sorted(unused.images_deep())
+        ui_layouts.box_list(
+            layout=layout,
+            title="Curves",
+            items=self.unused_curves,
+            icon="CURVE_DATA"
+        )
+
+        ui_layouts.box_list(
+            layout=layout,
+            title="Fonts",
+            items=self.unused_fonts,
+            icon="FONT_DATA"
+        )
+
         ui_layouts.box_list(
             layout=layout,
             title="Images",
-            items=images,
+            items=self.unused_images,
             icon="IMAGE_DATA"
         )
 
-        lights = sorted(unused.lights_deep())
         ui_layouts.box_list(
             layout=layout,
             title="Lights",
-            items=lights,
+            items=self.unused_lights,
             icon="OUTLINER_OB_LIGHT"
         )
 
-        materials = sorted(unused.materials_deep())
         ui_layouts.box_list(
             layout=layout,
             title="Materials",
-            items=materials,
+            items=self.unused_materials,
             icon="MATERIAL"
         )
 
-        node_groups = sorted(unused.node_groups_deep())
+        ui_layouts.box_list(
+            layout=layout,
+            title="Meshes",
+            items=self.unused_meshes,
+            icon="MESH_DATA"
+        )
+
         ui_layouts.box_list(
             layout=layout,
             title="Node Groups",
-            items=node_groups,
+            items=self.unused_node_groups,
             icon="NODETREE"
         )
 
-        particles = sorted(unused.particles_deep())
         ui_layouts.box_list(
             layout=layout,
             title="Particle Systems",
-            items=particles,
+            items=self.unused_particles,
             icon="PARTICLES"
         )
 
-        textures = sorted(unused.textures_deep())
+        ui_layouts.box_list(
+            layout=layout,
+            title="Sounds",
+            items=self.unused_sounds,
+            icon="SOUND"
+        )
+
         ui_layouts.box_list(
             layout=layout,
             title="Textures",
-            items=textures,
+            items=self.unused_textures,
             icon="TEXTURE"
         )
 
-        worlds = sorted(unused.worlds())
         ui_layouts.box_list(
             layout=layout,
             title="Worlds",
-            items=worlds,
+            items=self.unused_worlds,
             icon="WORLD"
         )
 
@@ -235,28 +292,56 @@ class ATOMIC_OT_clean_all(bpy.types.Operator):
 
     def execute(self, context):
 
-        clean.collections()
-        clean.images()
-        clean.lights()
-        clean.materials()
-        clean.node_groups()
-        clean.particles()
-        clean.textures()
-        clean.worlds()
-
+        remove.reset()
+
+        with remove.batch():
+            clean.actions(self.scan_result)
+            clean.armatures(self.scan_result)
+            clean.brushes(self.scan_result)
+            clean.collections(self.scan_result)
+            clean.curves(self.scan_result)
+            clean.fonts(self.scan_result)
+            clean.images(self.scan_result)
+            clean.lights(self.scan_result)
+            clean.materials(self.scan_result)
+            clean.meshes(self.scan_result)
+            clean.node_groups(self.scan_result)
+            clean.particles(self.scan_result)
+            clean.sounds(self.scan_result)
+            clean.textures(self.scan_result)
+            clean.worlds(self.scan_result)
+
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
 
-        self.unused_collections = unused.collections_deep()
-        self.unused_images = unused.images_deep()
-        self.unused_lights = unused.lights_deep()
-        self.unused_materials = unused.materials_deep()
-        self.unused_node_groups = unused.node_groups_deep()
-        self.unused_particles = unused.particles_deep()
-        self.unused_textures = unused.textures_deep()
-        self.unused_worlds = unused.worlds()
+        # finish scanning in the background if the scan takes too long,
+        # in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps()):
+            return {'CANCELLED'}
+
+        # the result of scanning every category at once
+        result = background.result()
+        self.scan_result = result
+
+        self.unused_actions = sorted(result.get('actions'))
+        self.unused_armatures = sorted(result.get('armatures'))
+        self.unused_brushes = sorted(result.get('brushes'))
+        self.unused_collections = sorted(result.get('collections'))
+        self.unused_curves = sorted(result.get('curves'))
+        self.unused_fonts = sorted(result.get('fonts'))
+        self.unused_images = sorted(result.get('images'))
+        self.unused_lights = sorted(result.get('lights'))
+        self.unused_materials = sorted(result.get('materials'))
+        self.unused_meshes = sorted(result.get('meshes'))
+        self.unused_node_groups = sorted(result.get('node_groups'))
+        self.unused_particles = sorted(result.get('particles'))
+        self.unused_sounds = sorted(result.get('sounds'))
+        self.unused_textures = sorted(result.get('textures'))
+        self.unused_worlds = sorted(result.get('worlds'))
 
         return wm.invoke_props_dialog(self)
 
@@ -283,7 +368,9 @@ class ATOMIC_OT_nuke_collections(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.collections()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -313,7 +400,9 @@ class ATOMIC_OT_nuke_images(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.images()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -343,7 +432,9 @@ class ATOMIC_OT_nuke_lights(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.lights()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -373,7 +464,9 @@ class ATOMIC_OT_nuke_materials(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.materials()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -403,7 +496,9 @@ class ATOMIC_OT_nuke_node_groups(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.node_groups()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -433,7 +528,9 @@ class ATOMIC_OT_nuke_particles(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.particles()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -463,7 +560,9 @@ class ATOMIC_OT_nuke_textures(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.textures()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -493,7 +592,9 @@ class ATOMIC_OT_nuke_worlds(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
+        remove.reset()
         nuke.worlds()
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -508,6 +609,7 @@ class ATOMIC_OT_clean_collections(bpy.types.Operator):
     bl_label = "Clean Collections"
 
     unused_collections = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -524,12 +626,21 @@ class ATOMIC_OT_clean_collections(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.collections()
+        remove.reset()
+        clean.collections(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_collections = unused.collections_deep()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['collections'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_collections = self.scan_result.get('collections')
         return wm.invoke_props_dialog(self)
 
 
@@ -540,6 +651,7 @@ class ATOMIC_OT_clean_images(bpy.types.Operator):
     bl_label = "Clean Images"
 
     unused_images = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -556,12 +668,21 @@ class ATOMIC_OT_clean_images(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.images()
+        remove.reset()
+        clean.images(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_images =unused.images_deep()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['images'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_images = self.scan_result.get('images')
         return wm.invoke_props_dialog(self)
 
 
@@ -572,6 +693,7 @@ class ATOMIC_OT_clean_lights(bpy.types.Operator):
     bl_label = "Clean Lights"
 
     unused_lights = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -588,12 +710,21 @@ class ATOMIC_OT_clean_lights(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.lights()
+        remove.reset()
+        clean.lights(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_lights = unused.lights_deep()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['lights'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_lights = self.scan_result.get('lights')
         return wm.invoke_props_dialog(self)
 
 
@@ -604,6 +735,7 @@ class ATOMIC_OT_clean_materials(bpy.types.Operator):
     bl_label = "Clean Materials"
 
     unused_materials = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -620,12 +752,21 @@ class ATOMIC_OT_clean_materials(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.materials()
+        remove.reset()
+        clean.materials(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_materials = unused.materials_deep()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['materials'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_materials = self.scan_result.get('materials')
         return wm.invoke_props_dialog(self)
 
 
@@ -636,6 +777,7 @@ class ATOMIC_OT_clean_node_groups(bpy.types.Operator):
     bl_label = "Clean Node Groups"
 
     unused_node_groups = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -652,12 +794,21 @@ class ATOMIC_OT_clean_node_groups(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.node_groups()
+        remove.reset()
+        clean.node_groups(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_node_groups = unused.node_groups_deep()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['node_groups'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_node_groups = self.scan_result.get('node_groups')
         return wm.invoke_props_dialog(self)
 
 
@@ -668,6 +819,7 @@ class ATOMIC_OT_clean_particles(bpy.types.Operator):
     bl_label = "Clean Particles"
 
     unused_particles = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -684,12 +836,21 @@ class ATOMIC_OT_clean_particles(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.particles()
+        remove.reset()
+        clean.particles(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_particles = unused.particles_deep()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['particles'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_particles = self.scan_result.get('particles')
         return wm.invoke_props_dialog(self)
 
 
@@ -700,6 +861,7 @@ class ATOMIC_OT_clean_textures(bpy.types.Operator):
     bl_label = "Clean Textures"
 
     unused_textures = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -716,12 +878,21 @@ class ATOMIC_OT_clean_textures(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.textures()
+        remove.reset()
+        clean.textures(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_textures = unused.textures_deep()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['textures'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_textures = self.scan_result.get('textures')
         return wm.invoke_props_dialog(self)
 
 
@@ -732,6 +903,7 @@ class ATOMIC_OT_clean_worlds(bpy.types.Operator):
     bl_label = "Clean Worlds"
 
     unused_worlds = []
+    scan_result = None
 
     def draw(self, context):
         layout = self.layout
@@ -748,12 +920,21 @@ class ATOMIC_OT_clean_worlds(bpy.types.Operator):
         row = layout.row()  # extra space
 
     def execute(self, context):
-        clean.worlds()
+        remove.reset()
+        clean.worlds(self.scan_result)
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        self.unused_worlds = unused.worlds()
+
+        # finish scanning in the background if the scan takes too long
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps(['worlds'])):
+            return {'CANCELLED'}
+
+        self.scan_result = background.result()
+        self.unused_worlds = self.scan_result.get('worlds')
         return wm.invoke_props_dialog(self)
 
 
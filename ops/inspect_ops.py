@@ -27,8 +27,10 @@ operators.
 import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
+from atomic_data_manager.stats import index
 from atomic_data_manager.ops.utils import delete
 from atomic_data_manager.ops.utils import duplicate
+from atomic_data_manager.ops.utils import remove
 
 
 # Atomic Data Manager Inspection Rename Operator
@@ -83,6 +85,7 @@ class ATOMIC_OT_inspection_rename(bpy.types.Operator):
             atom.worlds_field = name
 
         atom.rename_field = ""
+        index.invalidate()
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -213,6 +216,7 @@ class ATOMIC_OT_inspection_replace(bpy.types.Operator):
             atom.worlds_field = atom.replace_field
 
         atom.replace_field = ""
+        index.invalidate()
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -354,6 +358,7 @@ class ATOMIC_OT_inspection_delete(bpy.types.Operator):
     def execute(self, context):
         atom = bpy.context.scene.atomic
         inspection = atom.active_inspection
+        remove.reset()
 
         if inspection == 'COLLECTIONS':
             key = atom.collections_field
@@ -418,6 +423,7 @@ class ATOMIC_OT_inspection_delete(bpy.types.Operator):
                 delete.world(key)
                 atom.worlds_field = ""
 
+        remove.report(self)
         return {'FINISHED'}
 
 
@@ -27,9 +27,16 @@ various selection operations.
 import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
+from atomic_data_manager.stats import background
+from atomic_data_manager.stats import index
+from atomic_data_manager.stats import memory
+from atomic_data_manager.stats import misc
+from atomic_data_manager.stats import snapshot
 from atomic_data_manager.stats import unused
 from atomic_data_manager.ops.utils import clean
 from atomic_data_manager.ops.utils import nuke
+from atomic_data_manager.ops.utils import remove
+from atomic_data_manager.ops.utils import restore
 from atomic_data_manager.ui.utils import ui_layouts
 
 
@@ -47,14 +54,46 @@ class ATOMIC_OT_nuke(bpy.types.Operator):
         col.label(text="Remove the following data-blocks?")
 
         # No Data Section
-        if not (atom.collections or atom.images or atom.lights or
-                atom.materials or atom.node_groups or atom.particles or
-                atom.textures or atom.worlds):
+        if not (atom.actions or atom.armatures or atom.brushes or
+                atom.collections or atom.curves or atom.fonts or
+                atom.images or atom.lights or atom.materials or
+                atom.meshes or atom.node_groups or atom.particles or
+                atom.sounds or atom.textures or atom.worlds):
 
             ui_layouts.box_list(
                 layout=layout,
             )
 
+        # display when the main panel actions property is toggled
+        if atom.actions:
+            actions = sorted(bpy.data.actions.keys())
+            ui_layouts.box_list(
+                layout=layout,
+                title="Actions",
+                items=actions,
+                icon="ACTION"
+            )
+
+        # display when the main panel armatures property is toggled
+        if atom.armatures:
+            armatures = sorted(bpy.data.armatures.keys())
+            ui_layouts.box_list(
+                layout=layout,
+                title="Armatures",
+                items=armatures,
+                icon="ARMATURE_DATA"
+            )
+
+        # display when the main panel brushes property is toggled
+        if atom.brushes:
+            brushes = sorted(bpy.data.brushes.keys())
+            ui_layouts.box_list(
+                layout=layout,
+                title="Brushes",
+                items=brushes,
+                icon="BRUSH_DATA"
+            )
+
         # display when the main panel collections property is toggled
         if atom.collections:
             collections = sorted(bpy.data.collections.keys())
@@ -65,6 +104,26 @@ class ATOMIC_OT_nuke(bpy.types.Operator):
                 icon="OUTLINER_OB_GROUP_INSTANCE"
             )
 
+        # display when the main panel curves property is toggled
+        if atom.curves:
+            curves = sorted(bpy.data.curves.keys())
+            ui_layouts.box_list(
+                layout=layout,
+                title="Curves",
+                items=curves,
+                icon="CURVE_DATA"
+            )
+
+        # display when the main panel fonts property is toggled
+        if atom.fonts:
+            fonts = sorted(bpy.data.fonts.keys())
+            ui_layouts.box_list(
+                layout=layout,
+                title="Fonts",
+                items=fonts,
+                icon="FONT_DATA"
+            )
+
         # display when the main panel images property is toggled
         if atom.images:
             images = sorted(bpy.data.images.keys())
@@ -95,6 +154,16 @@ class ATOMIC_OT_nuke(bpy.types.Operator):
                 icon="MATERIAL"
             )
 
+        # display when the main panel meshes property is toggled
+        if atom.meshes:
+            meshes = sorted(bpy.data.meshes.keys())
+            ui_layouts.box_list(
+                layout=layout,
+                title="Meshes",
+                items=meshes,
+                icon="MESH_DATA"
+            )
+
         # display when the main panel node groups property is toggled
         if atom.node_groups:
             node_groups = sorted(bpy.data.node_groups.keys())
@@ -115,6 +184,16 @@ class ATOMIC_OT_nuke(bpy.types.Operator):
                 icon="PARTICLES"
             )
 
+        # display when the main panel sounds property is toggled
+        if atom.sounds:
+            sounds = sorted(bpy.data.sounds.keys())
+            ui_layouts.box_list(
+                layout=layout,
+                title="Sounds",
+                items=sounds,
+                icon="SOUND"
+            )
+
         # display when the main panel textures property is toggled
         if atom.textures:
             textures = sorted(bpy.data.textures.keys())
@@ -139,33 +218,57 @@ class ATOMIC_OT_nuke(bpy.types.Operator):
 
     def execute(self, context):
         atom = bpy.context.scene.atomic
+        remove.reset()
 
-        if atom.collections:
-            nuke.collections()
+        with remove.batch():
+            if atom.actions:
+                nuke.actions()
 
-        if atom.images:
-            nuke.images()
+            if atom.armatures:
+                nuke.armatures()
 
-        if atom.lights:
-            nuke.lights()
+            if atom.brushes:
+                nuke.brushes()
 
-        if atom.materials:
-            nuke.materials()
+            if atom.collections:
+                nuke.collections()
 
-        if atom.node_groups:
-            nuke.node_groups()
+            if atom.curves:
+                nuke.curves()
 
-        if atom.particles:
-            nuke.particles()
+            if atom.fonts:
+                nuke.fonts()
 
-        if atom.textures:
-            nuke.textures()
+            if atom.images:
+                nuke.images()
 
-        if atom.worlds:
-            nuke.worlds()
+            if atom.lights:
+                nuke.lights()
+
+            if atom.materials:
+                nuke.materials()
+
+            if atom.meshes:
+                nuke.meshes()
+
+            if atom.node_groups:
+                nuke.node_groups()
+
+            if atom.particles:
+                nuke.particles()
+
+            if atom.sounds:
+                nuke.sounds()
+
+            if atom.textures:
+                nuke.textures()
+
+            if atom.worlds:
+                nuke.worlds()
 
         bpy.ops.atomic.deselect_all()
 
+        remove.report(self)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -178,15 +281,45 @@ class ATOMIC_OT_clean(bpy.types.Operator):
     """Remove all unused data-blocks from the selected categories"""
     bl_idname = "atomic.clean"
     bl_label = "Clean"
-
+    bl_options = {'UNDO'}
+
+    # also remove the data-blocks that cleaning would leave unused
+    recursive: bpy.props.BoolProperty(
+        name="Recursive Purge",
+        description="Also remove the data-blocks that cleaning the "
+                    "selected categories would leave unused",
+        default=False
+    )
+
+    unused_actions = []
+    unused_armatures = []
+    unused_brushes = []
     unused_collections = []
+    unused_curves = []
+    unused_fonts = []
     unused_images = []
     unused_lights = []
     unused_materials = []
+    unused_meshes = []
     unused_node_groups = []
     unused_particles = []
+    unused_sounds = []
     unused_textures = []
     unused_worlds = []
+    orphan_cycles = []
+
+    # the scan result that is shown in the dialog and cleaned on execute
+    scan_result = None
+
+    # the estimated memory freed by cleaning each category
+    reclaimable = {}
+
+    # the estimated bytes freed by cleaning all of the selected categories
+    reclaimable_bytes = 0
+
+    # the data-blocks that cleaning would leave unused, grouped by depth,
+    # or None if the cascade has not been computed yet
+    cascade = None
 
     def draw(self, context):
         atom = bpy.context.scene.atomic
@@ -194,30 +327,98 @@ class ATOMIC_OT_clean(bpy.types.Operator):
 
         col = layout.column()
         col.label(text="Remove the following data-blocks?")
+        # the recursive estimate is only known once the cascade is found
+        reclaimable = self.reclaimable.get('TOTAL', misc.format_size(0))
+        if self.recursive:
+            reclaimable = self.reclaimable.get('RECURSIVE', reclaimable)
+
+        col.label(
+            text="About {0} of memory will be freed.".format(reclaimable)
+        )
+        col.prop(self, "recursive")
+
+        # the cascade is only found when the dialog is opened with the
+        # recursive purge enabled, since finding it walks the whole index
+        if self.recursive and self.cascade is None:
+            col.label(text="Reopen to list the data-blocks left unused.")
 
         # display if no main panel properties are toggled
-        if not (atom.collections or atom.images or atom.lights or
-                atom.materials or atom.node_groups or atom.particles
-                or atom.textures or atom.worlds):
+        if not (atom.actions or atom.armatures or atom.brushes or
+                atom.collections or atom.curves or atom.fonts or
+                atom.images or atom.lights or atom.materials or
+                atom.meshes or atom.node_groups or atom.particles or
+                atom.sounds or atom.textures or atom.worlds):
+
+            ui_layouts.box_list(
+                layout=layout,
+            )
 
+        # display when the main panel actions property is toggled
+        if atom.actions:
             ui_layouts.box_list(
                 layout=layout,
+                title="Actions ({0})".format(
+                    self.reclaimable['actions']),
+                items=self.unused_actions,
+                icon="ACTION"
+            )
+
+        # display when the main panel armatures property is toggled
+        if atom.armatures:
+            ui_layouts.box_list(
+                layout=layout,
+                title="Armatures ({0})".format(
+                    self.reclaimable['armatures']),
+                items=self.unused_armatures,
+                icon="ARMATURE_DATA"
+            )
+
+        # display when the main panel brushes property is toggled
+        if atom.brushes:
+            ui_layouts.box_list(
+                layout=layout,
+                title="Brushes ({0})".format(
+                    self.reclaimable['brushes']),
+                items=self.unused_brushes,
+                icon="BRUSH_DATA"
             )
 
         # display when the main panel collections property is toggled
         if atom.collections:
             ui_layouts.box_list(
                 layout=layout,
-                title="Collections",
+                title="Collections ({0})".format(
+                    self.reclaimable['collections']),
                 items=self.unused_collections,
                 icon="OUTLINER_OB_GROUP_INSTANCE"
             )
 
+        # display when the main panel curves property is toggled
+        if atom.curves:
+            ui_layouts.box_list(
+                layout=layout,
+                title="Curves ({0})".format(
+                    self.reclaimable['curves']),
+                items=self.unused_curves,
+                icon="CURVE_DATA"
+            )
+
+        # display when the main panel fonts property is toggled
+        if atom.fonts:
+            ui_layouts.box_list(
+                layout=layout,
+                title="Fonts ({0})".format(
+                    self.reclaimable['fonts']),
+                items=self.unused_fonts,
+                icon="FONT_DATA"
+            )
+
         # display when the main panel images property is toggled
         if atom.images:
             ui_layouts.box_list(
                 layout=layout,
-                title="Images",
+                title="Images ({0})".format(
+                    self.reclaimable['images']),
                 items=self.unused_images,
                 icon="IMAGE_DATA"
             )
@@ -226,7 +427,8 @@ class ATOMIC_OT_clean(bpy.types.Operator):
         if atom.lights:
             ui_layouts.box_list(
                 layout=layout,
-                title="Lights",
+                title="Lights ({0})".format(
+                    self.reclaimable['lights']),
                 items=self.unused_lights,
                 icon="OUTLINER_OB_LIGHT"
             )
@@ -235,16 +437,28 @@ class ATOMIC_OT_clean(bpy.types.Operator):
         if atom.materials:
             ui_layouts.box_list(
                 layout=layout,
-                title="Materials",
+                title="Materials ({0})".format(
+                    self.reclaimable['materials']),
                 items=self.unused_materials,
                 icon="MATERIAL"
             )
 
+        # display when the main panel meshes property is toggled
+        if atom.meshes:
+            ui_layouts.box_list(
+                layout=layout,
+                title="Meshes ({0})".format(
+                    self.reclaimable['meshes']),
+                items=self.unused_meshes,
+                icon="MESH_DATA"
+            )
+
         # display when the main panel node groups property is toggled
         if atom.node_groups:
             ui_layouts.box_list(
                 layout=layout,
-                title="Node Groups",
+                title="Node Groups ({0})".format(
+                    self.reclaimable['node_groups']),
                 items=self.unused_node_groups,
                 icon="NODETREE"
             )
@@ -253,18 +467,29 @@ class ATOMIC_OT_clean(bpy.types.Operator):
         if atom.particles:
             ui_layouts.box_list(
                 layout=layout,
-                title="Particle Systems",
+                title="Particle Systems ({0})".format(
+                    self.reclaimable['particles']),
                 items=self.unused_particles,
                 icon="PARTICLES"
             )
 
+        # display when the main panel sounds property is toggled
+        if atom.sounds:
+            ui_layouts.box_list(
+                layout=layout,
+                title="Sounds ({0})".format(
+                    self.reclaimable['sounds']),
+                items=self.unused_sounds,
+                icon="SOUND"
+            )
+
         # display when the main panel textures property is toggled
         if atom.textures:
-            textures = sorted(unused.textures_deep())
             ui_layouts.box_list(
                 layout=layout,
-                title="Textures",
-                items=textures,
+                title="Textures ({0})".format(
+                    self.reclaimable['textures']),
+                items=self.unused_textures,
                 icon="TEXTURE"
             )
 
@@ -272,117 +497,340 @@ class ATOMIC_OT_clean(bpy.types.Operator):
         if atom.worlds:
             ui_layouts.box_list(
                 layout=layout,
-                title="Worlds",
+                title="Worlds ({0})".format(
+                    self.reclaimable['worlds']),
                 items=self.unused_worlds,
                 icon="WORLD"
             )
 
+        # display orphan cycles that will be removed as a unit
+        if self.orphan_cycles:
+            ui_layouts.box_list(
+                layout=layout,
+                title="Orphan Cycles",
+                items=self.orphan_cycles,
+                columns=1,
+                icon="LOOP_BACK"
+            )
+
+        # display the data-blocks that cleaning would leave unused
+        if self.recursive and self.cascade is not None:
+            for depth, datablocks in enumerate(self.cascade, 1):
+                ui_layouts.box_list(
+                    layout=layout,
+                    title="Left Unused, Depth {0}".format(depth),
+                    items=[
+                        "{0}: {1}".format(
+                            category.replace("_", " ").title(), key)
+                        for category, key in datablocks
+                    ],
+                    columns=1
+                )
+
         row = layout.row()  # extra spacing
 
+    def selected_categories(self):
+        # returns the scan categories toggled in the main panel
+
+        atom = bpy.context.scene.atomic
+
+        return [
+            category for category in unused.scan_categories
+            if getattr(atom, category)
+        ]
+
+    def find_cascade(self, cascade=None):
+        # stores the data-blocks that cleaning would leave unused, finding
+        # them unless they were found by the background scan, and the
+        # memory that cleaning them as well would free
+
+        if cascade is None:
+            cascade = unused.cascade(self.scan_result)
+
+        self.cascade = cascade
+
+        cascade_bytes = 0
+        for datablocks in self.cascade:
+            for category, key in datablocks:
+                cascade_bytes += memory.size(category, key)
+
+        self.reclaimable['RECURSIVE'] = misc.format_size(
+            self.reclaimable_bytes + cascade_bytes)
+
     def execute(self, context):
         atom = bpy.context.scene.atomic
+        remove.reset()
 
-        if atom.collections:
-            clean.collections()
+        # scan the selected categories if the operator was executed
+        # without being invoked, such as from a script
+        if self.scan_result is None:
+            self.scan_result = unused.scan(self.selected_categories())
 
-        if atom.images:
-            clean.images()
+        # remove the cascade along with the selected categories in a
+        # single batch
+        if self.recursive:
+            if self.cascade is None:
+                self.find_cascade()
 
-        if atom.lights:
-            clean.lights()
+            clean.clean_recursive(self.scan_result, self.cascade)
+            bpy.ops.atomic.deselect_all()
 
-        if atom.materials:
-            clean.materials()
+            remove.report(self)
+            return {'FINISHED'}
 
-        if atom.node_groups:
-            clean.node_groups()
+        with remove.batch():
+            if atom.actions:
+                clean.actions(self.scan_result)
 
-        if atom.particles:
-            clean.particles()
+            if atom.armatures:
+                clean.armatures(self.scan_result)
 
-        if atom.textures:
-            clean.textures()
+            if atom.brushes:
+                clean.brushes(self.scan_result)
 
-        if atom.worlds:
-            clean.worlds()
+            if atom.collections:
+                clean.collections(self.scan_result)
 
-        bpy.ops.atomic.deselect_all()
+            if atom.curves:
+                clean.curves(self.scan_result)
 
-        return {'FINISHED'}
+            if atom.fonts:
+                clean.fonts(self.scan_result)
 
-    def invoke(self, context, event):
-        wm = context.window_manager
-        atom = bpy.context.scene.atomic
+            if atom.images:
+                clean.images(self.scan_result)
 
-        if atom.collections:
-            self.unused_collections = unused.collections_deep()
+            if atom.lights:
+                clean.lights(self.scan_result)
 
-        if atom.images:
-            self.unused_images = unused.images_deep()
+            if atom.materials:
+                clean.materials(self.scan_result)
 
-        if atom.lights:
-            self.unused_lights = unused.lights_deep()
+            if atom.meshes:
+                clean.meshes(self.scan_result)
 
-        if atom.materials:
-            self.unused_materials = unused.materials_deep()
+            if atom.node_groups:
+                clean.node_groups(self.scan_result)
 
-        if atom.node_groups:
-            self.unused_node_groups = unused.node_groups_deep()
+            if atom.particles:
+                clean.particles(self.scan_result)
 
-        if atom.particles:
-            self.unused_particles = unused.particles_deep()
+            if atom.sounds:
+                clean.sounds(self.scan_result)
 
-        if atom.textures:
-            self.unused_textures = unused.textures_deep()
+            if atom.textures:
+                clean.textures(self.scan_result)
 
-        if atom.worlds:
-            self.unused_worlds = unused.worlds()
+            if atom.worlds:
+                clean.worlds(self.scan_result)
+
+            # the orphan cycles are listed in the dialog
+            clean.clean_cycles(self.scan_result)
+
+        bpy.ops.atomic.deselect_all()
+
+        remove.report(self)
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        categories = self.selected_categories()
+
+        # finish scanning in the background if the scan takes too long,
+        # in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname,
+                unused.clean_steps(categories, self.recursive)):
+            return {'CANCELLED'}
+
+        # the result of scanning all of the selected categories at once,
+        # and the cascade if the purge is recursive
+        result, cascade = background.result()
+
+        # the selection may have changed while the scan was running in the
+        # background, in which case the scan is run again so that nothing
+        # is cleaned without being listed in the dialog
+        if result.categories != categories or \
+                (self.recursive and cascade is None):
+            if not background.run(
+                    context, self.bl_idname,
+                    unused.clean_steps(categories, self.recursive)):
+                return {'CANCELLED'}
+
+            result, cascade = background.result()
+
+        self.scan_result = result
+
+        self.unused_actions = \
+            memory.largest_first('actions', result.get('actions'))
+        self.unused_armatures = \
+            memory.largest_first('armatures', result.get('armatures'))
+        self.unused_brushes = \
+            memory.largest_first('brushes', result.get('brushes'))
+        self.unused_collections = \
+            memory.largest_first('collections', result.get('collections'))
+        self.unused_curves = \
+            memory.largest_first('curves', result.get('curves'))
+        self.unused_fonts = \
+            memory.largest_first('fonts', result.get('fonts'))
+        self.unused_images = \
+            memory.largest_first('images', result.get('images'))
+        self.unused_lights = \
+            memory.largest_first('lights', result.get('lights'))
+        self.unused_materials = \
+            memory.largest_first('materials', result.get('materials'))
+        self.unused_meshes = \
+            memory.largest_first('meshes', result.get('meshes'))
+        self.unused_node_groups = \
+            memory.largest_first('node_groups', result.get('node_groups'))
+        self.unused_particles = \
+            memory.largest_first('particles', result.get('particles'))
+        self.unused_sounds = \
+            memory.largest_first('sounds', result.get('sounds'))
+        self.unused_textures = \
+            memory.largest_first('textures', result.get('textures'))
+        self.unused_worlds = \
+            memory.largest_first('worlds', result.get('worlds'))
+
+        # the estimated memory freed by cleaning each category
+        reclaimable_bytes = {
+            category: memory.total(category, result.get(category))
+            for category in categories
+        }
+
+        self.reclaimable = {
+            category: misc.format_size(size_bytes)
+            for category, size_bytes in reclaimable_bytes.items()
+        }
+
+        self.reclaimable_bytes = sum(reclaimable_bytes.values())
+        self.reclaimable['TOTAL'] = \
+            misc.format_size(self.reclaimable_bytes)
+
+        # the cascade is found again for every new scan, but only by the
+        # background scan of a recursive purge, so neither opening the
+        # dialog nor redrawing it walks the index
+        self.cascade = None
+        if cascade is not None:
+            self.find_cascade(cascade)
+
+        # orphan cycles that contain a data-block that will be cleaned
+        self.orphan_cycles = [
+            ", ".join(key for category, key in cycle)
+            for cycle in result.orphan_cycles
+        ]
 
         return wm.invoke_props_dialog(self)
 
 
 # Atomic Data Manager Undo Operator
 class ATOMIC_OT_undo(bpy.types.Operator):
-    """Undo the previous action"""
+    """Restore the data-blocks that Atomic removed last"""
     bl_idname = "atomic.undo"
     bl_label = "Undo"
 
     def execute(self, context):
-        bpy.ops.ed.undo()
+        restored = restore.undo()
+
+        # fall back to a global undo step if nothing was removed
+        if restored is None:
+            bpy.ops.ed.undo()
+        else:
+            self.report(
+                {'INFO'}, "Restored {0} data-blocks".format(restored))
+
         return {'FINISHED'}
 
 
-# Atomic Data Manager Smart Select Operator
-class ATOMIC_OT_smart_select(bpy.types.Operator):
-    """Auto-select categories with unused data"""
-    bl_idname = "atomic.smart_select"
-    bl_label = "Smart Select"
+# Atomic Data Manager Cancel Scan Operator
+class ATOMIC_OT_cancel_scan(bpy.types.Operator):
+    """Cancel the scan that is running in the background"""
+    bl_idname = "atomic.cancel_scan"
+    bl_label = "Cancel Scan"
 
     def execute(self, context):
+        background.cancel()
+        return {'FINISHED'}
+
 
-        bpy.context.scene.atomic.collections = \
-            any(unused.collections_deep())
+# Atomic Data Manager Refresh Stats Operator
+class ATOMIC_OT_refresh_stats(bpy.types.Operator):
+    """Recompute the statistics in the Stats for Nerds panel"""
+    bl_idname = "atomic.refresh_stats"
+    bl_label = "Refresh Stats"
+
+    def execute(self, context):
+        snapshot.invalidate()
+        return {'FINISHED'}
 
-        bpy.context.scene.atomic.images = \
-            any(unused.images_deep())
 
-        bpy.context.scene.atomic.lights = \
-            any(unused.lights_deep())
+# Atomic Data Manager Check User Graph Operator
+class ATOMIC_OT_check_user_graph(bpy.types.Operator):
+    """Compare the users found by the Atomic walker with the users found
+    by Blender's native user map"""
+    bl_idname = "atomic.check_user_graph"
+    bl_label = "Check User Graph"
 
-        bpy.context.scene.atomic.materials = \
-            any(unused.materials_deep())
+    def execute(self, context):
+        differences = index.compare(
+            index.ReferenceIndex(backend='ATOMIC'),
+            index.ReferenceIndex(backend='NATIVE')
+        )
+
+        # print each difference to the console
+        for datablock, category, only_atomic, only_native in differences:
+            print(
+                "Atomic: {0} \"{1}\" {2} users only found by the Atomic "
+                "walker: {3}, only found by the native user map: {4}"
+                .format(datablock[0], datablock[1], category,
+                        only_atomic, only_native)
+            )
 
-        bpy.context.scene.atomic.node_groups = \
-            any(unused.node_groups_deep())
+        if differences:
+            self.report(
+                {'WARNING'},
+                "Found {0} differences between the user graph backends, "
+                "see the console for details".format(len(differences))
+            )
+        else:
+            self.report({'INFO'}, "The user graph backends agree")
 
-        bpy.context.scene.atomic.particles = \
-            any(unused.particles_deep())
+        return {'FINISHED'}
 
-        bpy.context.scene.atomic.textures = \
-            any(unused.textures_deep())
 
-        bpy.context.scene.atomic.worlds = \
-            any(unused.worlds())
+# Atomic Data Manager Smart Select Operator
+class ATOMIC_OT_smart_select(bpy.types.Operator):
+    """Auto-select categories with unused data"""
+    bl_idname = "atomic.smart_select"
+    bl_label = "Smart Select"
+
+    def execute(self, context):
+        atom = bpy.context.scene.atomic
+
+        # finish scanning in the background if the scan takes too long,
+        # in which case this operator is run again when it finishes
+        if not background.run(
+                context, self.bl_idname, unused.scan_steps()):
+            return {'CANCELLED'}
+
+        # the result of scanning every category at once
+        result = background.result()
+
+        atom.actions = any(result.get('actions'))
+        atom.armatures = any(result.get('armatures'))
+        atom.brushes = any(result.get('brushes'))
+        atom.collections = any(result.get('collections'))
+        atom.curves = any(result.get('curves'))
+        atom.fonts = any(result.get('fonts'))
+        atom.images = any(result.get('images'))
+        atom.lights = any(result.get('lights'))
+        atom.materials = any(result.get('materials'))
+        atom.meshes = any(result.get('meshes'))
+        atom.node_groups = any(result.get('node_groups'))
+        atom.particles = any(result.get('particles'))
+        atom.sounds = any(result.get('sounds'))
+        atom.textures = any(result.get('textures'))
+        atom.worlds = any(result.get('worlds'))
 
         return {'FINISHED'}
 
@@ -394,12 +842,19 @@ class ATOMIC_OT_select_all(bpy.types.Operator):
     bl_label = "Select All"
 
     def execute(self, context):
+        bpy.context.scene.atomic.actions = True
+        bpy.context.scene.atomic.armatures = True
+        bpy.context.scene.atomic.brushes = True
         bpy.context.scene.atomic.collections = True
+        bpy.context.scene.atomic.curves = True
+        bpy.context.scene.atomic.fonts = True
         bpy.context.scene.atomic.images = True
         bpy.context.scene.atomic.lights = True
         bpy.context.scene.atomic.materials = True
+        bpy.context.scene.atomic.meshes = True
         bpy.context.scene.atomic.node_groups = True
         bpy.context.scene.atomic.particles = True
+        bpy.context.scene.atomic.sounds = True
         bpy.context.scene.atomic.textures = True
         bpy.context.scene.atomic.worlds = True
         return {'FINISHED'}
@@ -412,12 +867,19 @@ class ATOMIC_OT_deselect_all(bpy.types.Operator):
     bl_label = "Deselect All"
 
     def execute(self, context):
+        bpy.context.scene.atomic.actions = False
+        bpy.context.scene.atomic.armatures = False
+        bpy.context.scene.atomic.brushes = False
         bpy.context.scene.atomic.collections = False
+        bpy.context.scene.atomic.curves = False
+        bpy.context.scene.atomic.fonts = False
         bpy.context.scene.atomic.images = False
         bpy.context.scene.atomic.lights = False
         bpy.context.scene.atomic.materials = False
+        bpy.context.scene.atomic.meshes = False
         bpy.context.scene.atomic.node_groups = False
         bpy.context.scene.atomic.particles = False
+        bpy.context.scene.atomic.sounds = False
         bpy.context.scene.atomic.textures = False
         bpy.context.scene.atomic.worlds = False
 
@@ -428,6 +890,9 @@ reg_list = [
     ATOMIC_OT_nuke,
     ATOMIC_OT_clean,
     ATOMIC_OT_undo,
+    ATOMIC_OT_cancel_scan,
+    ATOMIC_OT_refresh_stats,
+    ATOMIC_OT_check_user_graph,
     ATOMIC_OT_smart_select,
     ATOMIC_OT_select_all,
     ATOMIC_OT_deselect_all
@@ -24,8 +24,11 @@ the option to reload, remove, replace, and search for these missing files.
 It also contains the post-reload report dialog that appears after
 attempting to reload missing project files.
 
-# TODO: implement missing file replace and search once Blender fixes the
-# TODO: bugs with the file chooser not opening from a dialog
+Missing files are searched for in the search roots in Atomic's
+preferences through the file index in stats.search.py.
+
+# TODO: implement missing file replace once Blender fixes the bugs with
+# TODO: the file chooser not opening from a dialog
 
 """
 
@@ -33,6 +36,7 @@ import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
 from atomic_data_manager.stats import missing
+from atomic_data_manager.stats import search
 from atomic_data_manager.ui.utils import ui_layouts
 
 
@@ -51,6 +55,9 @@ class ATOMIC_OT_reload_missing(bpy.types.Operator):
         for library in bpy.data.libraries:
             library.reload()
 
+        # list the directories again since files may have been restored
+        missing.clear_cache()
+
         # call reload report
         bpy.ops.atomic.reload_report('INVOKE_DEFAULT')
         return {'FINISHED'}
@@ -134,25 +141,85 @@ class ATOMIC_OT_remove_missing(bpy.types.Operator):
         return wm.invoke_props_dialog(self)
 
 
-# TODO: Implement search for missing once file browser bugs are fixed
 # Atomic Data Manager Search for Missing Files Operator
 class ATOMIC_OT_search_missing(bpy.types.Operator):
-    """Search a specified directory for the missing files"""
+    """Search the search roots in the preferences for the missing files"""
     bl_idname = "atomic.search_missing"
     bl_label = "Search for Missing Files"
 
+    # the paths of the files found for each missing data-block, keyed by
+    # the data-block's (category, key) pair
+    found = {}
+
+    # the keys of the missing data-blocks that no file was found for
+    unresolved = []
+
     def draw(self, context):
         layout = self.layout
 
+        # display if no search roots have been set
+        if not search.roots():
+            row = layout.row()
+            row.label(text="Add search roots in Atomic's preferences.")
+            return
+
         row = layout.row()
-        row.label(text="Unsupported Operation!")
+        row.label(text="Relink the following data-blocks?")
+
+        ui_layouts.box_list(
+            layout=layout,
+            title="Found",
+            items=["{0}: {1}".format(key, path) for (category, key), path
+                   in self.found.items()],
+            columns=1
+        )
+
+        ui_layouts.box_list(
+            layout=layout,
+            title="Not Found",
+            items=self.unresolved,
+            columns=2
+        )
+
+        row = layout.row()  # extra space
 
     def execute(self, context):
+        for (category, key), path in self.found.items():
+            datablock = getattr(bpy.data, category).get(key)
+
+            if datablock is not None:
+                datablock.filepath = path
+                datablock.reload()
+
+        # list the directories again since the files have moved
+        missing.clear_cache()
+
+        self.report({'INFO'}, "Relinked {0} files".format(len(self.found)))
         return {'FINISHED'}
 
     def invoke(self, context, event):
         wm = context.window_manager
-        return wm.invoke_props_dialog(self)
+
+        self.found = {}
+        self.unresolved = []
+
+        if search.roots():
+            file_index = search.get()
+
+            for category, keys in (('images', missing.images()),
+                                   ('libraries', missing.libraries())):
+                data = getattr(bpy.data, category)
+
+                for key in keys:
+                    path = file_index.find(
+                        bpy.path.abspath(data[key].filepath))
+
+                    if path is not None:
+                        self.found[(category, key)] = path
+                    else:
+                        self.unresolved.append(key)
+
+        return wm.invoke_props_dialog(self, width=500)
 
 
 # TODO: Implement replace missing once file browser bugs are fixed
@@ -22,53 +22,126 @@ This file contains functions for cleaning out specific data categories.
 
 """
 
-import bpy
 from atomic_data_manager.stats import unused
+from atomic_data_manager.ops.utils import remove
 
 
-def collections():
+def clean_data(category, keys):
+    # removes the data-blocks with the specified keys from the category
+    remove.remove_data([(category, key) for key in keys])
+
+
+def clean_cycles(result):
+    # removes every member of the orphan cycles that were found by a scan
+    # as a unit. only operators that list the cycles remove them, so
+    # nothing is removed without being shown to the user
+
+    removals = []
+    for cycle in result.orphan_cycles:
+        removals += cycle
+
+    remove.remove_data(removals)
+
+
+def clean_recursive(result, cascade):
+    # removes the unused data-blocks that were found by a scan, their
+    # orphan cycles and the cascade of data-blocks that removing them
+    # would leave unused, all in a single batch
+
+    removals = []
+    for category, keys in result.unused.items():
+        removals += [(category, key) for key in keys]
+
+    for cycle in result.orphan_cycles:
+        removals += cycle
+
+    for depth in cascade:
+        removals += depth
+
+    remove.remove_data(removals)
+
+
+def clean_scanned(category, result=None):
+    # removes the unused data-blocks in the category that were found by
+    # a scan, so exactly what was shown to the user is removed. the
+    # category is scanned if no scan result is specified
+
+    if result is None:
+        result = unused.scan([category])
+
+    clean_data(category, result.get(category))
+
+
+def actions(result=None):
+    # removes all unused actions from the project
+    clean_scanned('actions', result)
+
+
+def armatures(result=None):
+    # removes all unused armatures from the project
+    clean_scanned('armatures', result)
+
+
+def brushes(result=None):
+    # removes all unused brushes from the project
+    clean_scanned('brushes', result)
+
+
+def collections(result=None):
     # removes all unused collections from the project
-    for collection_key in unused.collections_deep():
-        bpy.data.collections.remove(bpy.data.collections[collection_key])
+    clean_scanned('collections', result)
+
 
+def curves(result=None):
+    # removes all unused curves from the project
+    clean_scanned('curves', result)
 
-def images():
+
+def fonts(result=None):
+    # removes all unused fonts from the project
+    clean_scanned('fonts', result)
+
+
+def images(result=None):
     # removes all unused images from the project
-    for image_key in unused.images_deep():
-        bpy.data.images.remove(bpy.data.images[image_key])
+    clean_scanned('images', result)
 
 
-def lights():
+def lights(result=None):
     # removes all unused lights from the project
-    for light_key in unused.lights_deep():
-        bpy.data.lights.remove(bpy.data.lights[light_key])
+    clean_scanned('lights', result)
 
 
-def materials():
+def materials(result=None):
     # removes all unused materials from the project
-    for light_key in unused.materials_deep():
-        bpy.data.materials.remove(bpy.data.materials[light_key])
+    clean_scanned('materials', result)
+
 
+def meshes(result=None):
+    # removes all unused meshes from the project
+    clean_scanned('meshes', result)
 
-def node_groups():
+
+def node_groups(result=None):
     # removes all unused node groups from the project
-    for node_group_key in unused.node_groups_deep():
-        bpy.data.node_groups.remove(bpy.data.node_groups[node_group_key])
+    clean_scanned('node_groups', result)
 
 
-def particles():
+def particles(result=None):
     # removes all unused particle systems from the project
-    for particle_key in unused.particles_deep():
-        bpy.data.particles.remove(bpy.data.particles[particle_key])
+    clean_scanned('particles', result)
+
+
+def sounds(result=None):
+    # removes all unused sounds from the project
+    clean_scanned('sounds', result)
 
 
-def textures():
+def textures(result=None):
     # removes all unused textures from the project
-    for texture_key in unused.textures_deep():
-        bpy.data.textures.remove(bpy.data.textures[texture_key])
+    clean_scanned('textures', result)
 
 
-def worlds():
+def worlds(result=None):
     # removes all unused worlds from the project
-    for world_key in unused.worlds():
-        bpy.data.worlds.remove(bpy.data.worlds[world_key])
+    clean_scanned('worlds', result)
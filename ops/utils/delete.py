@@ -23,49 +23,49 @@ Atomic's inspection inteface.
 
 """
 
-import bpy
+from atomic_data_manager.ops.utils import remove
 
 
-def delete_datablock(data, key):
-    # deletes a specific data-block from a set of data
-    data.remove(data[key])
+def delete_datablock(category, key):
+    # deletes a specific data-block from a category
+    remove.remove_data([(category, key)])
 
 
 def collection(key):
     # removes a specific collection
-    delete_datablock(bpy.data.collections, key)
+    delete_datablock('collections', key)
 
 
 def image(key):
     # removes a specific image
-    delete_datablock(bpy.data.images, key)
+    delete_datablock('images', key)
 
 
 def light(key):
     # removes a specific light
-    delete_datablock(bpy.data.lights, key)
+    delete_datablock('lights', key)
 
 
 def material(key):
     # removes a specific material
-    delete_datablock(bpy.data.materials, key)
+    delete_datablock('materials', key)
 
 
 def node_group(key):
     # removes a specific node group
-    delete_datablock(bpy.data.node_groups, key)
+    delete_datablock('node_groups', key)
 
 
 def particle(key):
     # removes a specific particle system
-    delete_datablock(bpy.data.particles, key)
+    delete_datablock('particles', key)
 
 
 def texture(key):
     # removes a specific texture
-    delete_datablock(bpy.data.textures, key)
+    delete_datablock('textures', key)
 
 
 def world(key):
     # removes a specific world
-    delete_datablock(bpy.data.worlds, key)
+    delete_datablock('worlds', key)
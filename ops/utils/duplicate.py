@@ -24,11 +24,14 @@ inspection interface.
 """
 
 import bpy
+from atomic_data_manager.stats import index
 
 
 def duplicate_data(data, key):
     # creates a copy of the specified data-block and returns its key
-    return data[key].copy().name
+    copy_key = data[key].copy().name
+    index.invalidate()
+    return copy_key
 
 
 def collection(key):
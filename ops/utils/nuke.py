@@ -24,49 +24,85 @@ data categories.
 """
 
 import bpy
+from atomic_data_manager.ops.utils import remove
 
 
-def nuke_data(data):
-    # removes all data-blocks from the indicated set of data
-    for key in data.keys():
-        data.remove(data[key])
+def nuke_data(category):
+    # removes all data-blocks from the indicated category
+    keys = getattr(bpy.data, category).keys()
+    remove.remove_data([(category, key) for key in keys])
+
+
+def actions():
+    # removes all actions from the project
+    nuke_data('actions')
+
+
+def armatures():
+    # removes all armatures from the project
+    nuke_data('armatures')
+
+
+def brushes():
+    # removes all brushes from the project
+    nuke_data('brushes')
 
 
 def collections():
     # removes all collections from the project
-    nuke_data(bpy.data.collections)
+    nuke_data('collections')
+
+
+def curves():
+    # removes all curves from the project
+    nuke_data('curves')
+
+
+def fonts():
+    # removes all fonts from the project
+    nuke_data('fonts')
 
 
 def images():
     # removes all images from the project
-    nuke_data(bpy.data.images)
+    nuke_data('images')
 
 
 def lights():
     # removes all lights from the project
-    nuke_data(bpy.data.lights)
+    nuke_data('lights')
 
 
 def materials():
     # removes all materials from the project
-    nuke_data(bpy.data.materials)
+    nuke_data('materials')
+
+
+def meshes():
+    # removes all meshes from the project
+    nuke_data('meshes')
 
 
 def node_groups():
     # removes all node groups from the project
-    nuke_data(bpy.data.node_groups)
+    nuke_data('node_groups')
 
 
 def particles():
     # removes all particle systems from the project
-    nuke_data(bpy.data.particles)
+    nuke_data('particles')
+
+
+def sounds():
+    # removes all sounds from the project
+    nuke_data('sounds')
 
 
 def textures():
     # removes all textures from the project
-    nuke_data(bpy.data.textures)
+    nuke_data('textures')
 
 
 def worlds():
     # removes all worlds from the project
-    nuke_data(bpy.data.worlds)
+    nuke_data('worlds')
@@ -0,0 +1,140 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains the function that every clean, nuke and delete
+operation removes data-blocks with.
+
+Removing data-blocks one at a time makes Blender remap the users of the
+whole file once per data-block. Data-blocks are instead collected and
+removed in chunks with bpy.data.batch_remove(), which remaps the users of
+each chunk in a single pass. The removals are timed so operators can
+report how many data-blocks were removed and how long it took, and the
+removed data-blocks are saved by ops.utils.restore.py first so Atomic's
+undo can bring them back. Operators that remove several categories open a
+batch() so that all of their removals share a single snapshot and a
+single remap.
+
+"""
+
+import bpy
+import time
+import contextlib
+from atomic_data_manager.stats import index
+from atomic_data_manager.ops.utils import restore
+
+
+# the largest number of data-blocks removed in a single batch
+chunk_size = 1000
+
+# the number of data-blocks removed and the seconds spent removing them
+# since the tally was last reset
+removed_count = 0
+removed_seconds = 0.0
+
+# the removals deferred by the open batch, or None if no batch is open
+pending = None
+
+
+def remove_data(removals):
+    # removes the data-blocks with the specified (category, key) pairs
+    # and returns the number of data-blocks that were removed, which is
+    # zero while a batch defers the removals
+
+    global removed_count
+    global removed_seconds
+
+    if pending is not None:
+        pending.extend(removals)
+        return 0
+
+    # the data-blocks to remove, skipping data-blocks that no longer exist
+    # and pairs that repeat
+    datablocks = {}
+    for category, key in removals:
+        datablock = getattr(bpy.data, category).get(key)
+
+        if datablock is not None:
+            datablocks[(category, key)] = datablock
+
+    # save the data-blocks so that Atomic's undo can restore them
+    restore.save(datablocks)
+
+    # only the removal itself is timed, not writing the undo snapshot
+    started = time.perf_counter()
+    targets = list(datablocks.values())
+
+    # bpy.data.batch_remove() is not available before Blender 2.81
+    if hasattr(bpy.data, 'batch_remove'):
+        for start in range(0, len(targets), chunk_size):
+            bpy.data.batch_remove(targets[start:start + chunk_size])
+
+    else:
+        for category, key in datablocks:
+            data = getattr(bpy.data, category)
+            data.remove(datablocks[(category, key)])
+
+    if targets:
+        index.invalidate()
+
+    removed_count += len(targets)
+    removed_seconds += time.perf_counter() - started
+
+    return len(targets)
+
+
+@contextlib.contextmanager
+def batch():
+    # defers every removal made inside the with statement and removes
+    # them all at once when it ends, so undo saves a single snapshot and
+    # the index is only rebuilt once. nothing is removed if the statement
+    # raises an error
+
+    global pending
+
+    pending = []
+
+    try:
+        yield
+    except BaseException:
+        pending = None
+        raise
+
+    removals = pending
+    pending = None
+    remove_data(removals)
+
+
+def reset():
+    # resets the tally of removed data-blocks and starts a new removal
+    # operation that Atomic's undo restores as a whole
+
+    global removed_count
+    global removed_seconds
+
+    removed_count = 0
+    removed_seconds = 0.0
+
+    restore.begin()
+
+
+def report(operator):
+    # reports the tally of removed data-blocks through the operator
+    operator.report({'INFO'}, "Removed {0} data-blocks in {1:.1f} ms".format(
+        removed_count, removed_seconds * 1000))
@@ -0,0 +1,457 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains functions that save data-blocks before Atomic removes
+them so that Atomic's undo can restore them.
+
+Before data-blocks are removed, they are written to a temporary .blend
+file with bpy.data.libraries.write(). Undoing appends exactly those
+data-blocks back from the file, so restoring them costs as much as the
+data that was removed rather than the whole project like a global undo
+step does.
+
+The data-blocks that the removed data-blocks use but that are not removed
+are written to the file as well. Each of them is tagged with a temporary
+ID property while the file is written, so the copies that come back with
+the removed data-blocks can be told apart and remapped to the originals.
+The properties of the remaining data-blocks that pointed at the removed
+data-blocks, such as the material slots of objects, are recorded from the
+reference index before the removal and pointed back at them on restore.
+
+Saving is not free: every removal writes the removed data-blocks and all
+of the data they use, such as the images of removed materials, so its
+time and disk space grow with that data rather than with the removal
+alone. Only the latest max_operations removal operations can be undone,
+and the files of older operations are deleted as new ones begin.
+
+"""
+
+import bpy
+import os
+import shutil
+import tempfile
+from bpy.app.handlers import persistent
+from atomic_data_manager.stats import index
+
+
+# Atomic Data Manager Removal Snapshot
+class RemovalSnapshot:
+    # a temporary .blend file holding data-blocks that were removed
+
+    def __init__(self, filepath, removed, fake_users, originals, users):
+
+        # the path of the temporary .blend file
+        self.filepath = filepath
+
+        # a dictionary that maps each category to the keys of the removed
+        # data-blocks in it
+        self.removed = removed
+
+        # the (category, key) pairs of the removed data-blocks that had a
+        # fake user, since every data-block is written with one
+        self.fake_users = fake_users
+
+        # the (category, key, pointer) of each data-block that was written
+        # because a removed data-block uses it, indexed by the value of
+        # the ID property that its copy in the file is tagged with
+        self.originals = originals
+
+        # the properties of the remaining data-blocks that pointed at a
+        # removed data-block, as (owner, path, (category, key)) tuples
+        self.users = users
+
+
+# the name of the temporary ID property that tags the data-blocks written
+# to a snapshot because a removed data-block uses them
+copy_property = "atomic_restore"
+
+# the read-only pointers to data embedded in a data-block whose own
+# properties are searched for users of the removed data-blocks
+embedded_attributes = ['collection', 'node_tree']
+
+# the directory that holds the temporary .blend files or None if it has
+# not been created yet
+snapshot_directory = None
+
+# the number of temporary .blend files written to the directory, which
+# numbers their names
+snapshot_count = 0
+
+# the most removal operations that can be undone
+max_operations = 10
+
+# the snapshots of each removal operation that can be undone, from the
+# oldest to the latest. each removal operation is a list of snapshots
+operations = []
+
+
+def begin():
+    # starts a new removal operation, so the removals that follow are
+    # undone together, and deletes the snapshots of the operations that
+    # no longer fit within max_operations
+
+    # an operation that removed nothing cannot be undone
+    while operations and not operations[-1]:
+        operations.pop()
+
+    operations.append([])
+
+    while len(operations) > max_operations:
+        for snapshot in operations.pop(0):
+            delete(snapshot)
+
+
+def delete(snapshot):
+    # deletes the temporary .blend file of a snapshot
+    try:
+        os.remove(snapshot.filepath)
+    except OSError:
+        pass
+
+
+def save(datablocks):
+    # writes the data-blocks in a dictionary keyed by their (category,
+    # key) pairs to a temporary .blend file so that they can be restored
+    # after they are removed
+
+    global snapshot_directory
+    global snapshot_count
+
+    if not datablocks:
+        return
+
+    if snapshot_directory is None:
+        snapshot_directory = tempfile.mkdtemp(prefix="atomic_undo_")
+
+    filepath = os.path.join(
+        snapshot_directory, "removed_{0}.blend".format(snapshot_count))
+    snapshot_count += 1
+
+    reference_index = index.get()
+    removed_keys = set(datablocks)
+
+    # tag the data-blocks that are written along with the removed ones,
+    # skipping linked data-blocks since they are linked again on append
+    originals = []
+    tagged = []
+
+    for category, key in reference_index.reachable(removed_keys) - \
+            removed_keys:
+        datablock = getattr(bpy.data, category).get(key)
+
+        if datablock is not None and datablock.library is None:
+            datablock[copy_property] = len(originals)
+            originals.append((category, key, datablock.as_pointer()))
+            tagged.append(datablock)
+
+    # only the copies in the file keep their tags
+    try:
+        bpy.data.libraries.write(
+            filepath, set(datablocks.values()), fake_user=True)
+    finally:
+        for datablock in tagged:
+            del datablock[copy_property]
+
+    removed = {}
+    fake_users = set()
+
+    for (category, key), datablock in datablocks.items():
+        removed.setdefault(category, []).append(key)
+
+        if datablock.use_fake_user:
+            fake_users.add((category, key))
+
+    users = record_users(reference_index, datablocks)
+
+    if not operations:
+        begin()
+
+    operations[-1].append(
+        RemovalSnapshot(filepath, removed, fake_users, originals, users))
+
+
+def record_users(reference_index, datablocks):
+    # returns the properties of the remaining data-blocks that point at
+    # the data-blocks in a dictionary keyed by their (category, key)
+    # pairs, as (owner, path, (category, key)) tuples
+
+    pointers = {datablock.as_pointer(): reference
+                for reference, datablock in datablocks.items()}
+
+    # the owners that use the data-blocks according to the index
+    owners = set()
+    for reference in datablocks:
+        for category, keys in reference_index.users.get(
+                reference, {}).items():
+            for key in keys:
+                owners.add((category, key))
+
+    users = []
+    for category, key in owners - set(datablocks):
+        owner = getattr(bpy.data, category).get(key)
+
+        if owner is not None:
+            for path, reference in reference_sites(owner, pointers):
+                users.append(((category, key), path, reference))
+
+    return users
+
+
+def reference_sites(struct, pointers, path=()):
+    # returns a list of (path, (category, key)) pairs for the writable
+    # properties of the struct, the items in its collections and the data
+    # embedded in it that point at a data-block with one of the pointers.
+    # each path is a tuple of the attribute names and collection indices
+    # that lead from the data-block to the property
+
+    sites = []
+
+    for prop in struct.bl_rna.properties:
+        name = prop.identifier
+
+        if prop.type == 'POINTER':
+            value = getattr(struct, name)
+
+            if not isinstance(value, bpy.types.ID):
+                continue
+
+            if not prop.is_readonly and value.as_pointer() in pointers:
+                sites.append((path + (name,), pointers[value.as_pointer()]))
+
+            # data embedded in the data-block, such as a material's nodes
+            elif prop.is_readonly and not path and \
+                    name in embedded_attributes:
+                sites += reference_sites(value, pointers, (name,))
+
+        elif prop.type == 'COLLECTION' and len(path) < 2:
+            for i, item in enumerate(getattr(struct, name)):
+
+                # collections of data-blocks, such as a mesh's materials
+                if isinstance(item, bpy.types.ID):
+                    if item.as_pointer() in pointers:
+                        sites.append((path + (name, i),
+                                      pointers[item.as_pointer()]))
+                    continue
+
+                for item_prop in item.bl_rna.properties:
+                    if item_prop.type != 'POINTER' or item_prop.is_readonly:
+                        continue
+
+                    value = getattr(item, item_prop.identifier)
+
+                    if isinstance(value, bpy.types.ID) and \
+                            value.as_pointer() in pointers:
+                        sites.append(
+                            (path + (name, i, item_prop.identifier),
+                             pointers[value.as_pointer()]))
+
+    return sites
+
+
+def reassign(owner, path, datablock):
+    # points the property at the end of the path from the owner back at
+    # the restored data-block, unless the property has been changed since
+    # the data-block was removed
+
+    *steps, last = path
+    target = owner
+
+    # the owner's properties may have changed shape since the removal,
+    # such as when nodes were deleted
+    for step in steps:
+        if isinstance(step, int):
+            if step >= len(target):
+                return
+
+            target = target[step]
+
+        else:
+            target = getattr(target, step, None)
+
+            if target is None:
+                return
+
+    # a collection of data-blocks that are linked rather than assigned,
+    # such as the objects in a collection
+    if isinstance(last, int) and hasattr(target, 'link'):
+        if datablock not in target.values():
+            target.link(datablock)
+
+    elif isinstance(last, int):
+        if last < len(target) and target[last] is None:
+            target[last] = datablock
+
+    elif hasattr(target, last) and getattr(target, last) is None:
+        setattr(target, last, datablock)
+
+
+def find_original(category, key, pointer):
+    # returns the data-block that a copy in a snapshot was copied from or
+    # None if it no longer exists
+
+    data = getattr(bpy.data, category)
+    datablock = data.get(key)
+
+    if datablock is not None and datablock.as_pointer() == pointer:
+        return datablock
+
+    # the original may have been renamed since
+    for datablock in data:
+        if datablock.as_pointer() == pointer:
+            return datablock
+
+    return None
+
+
+def find_copies(restored):
+    # returns a list of (category, copy) pairs of the tagged copies that
+    # the restored (category, data-block) pairs use, directly or through
+    # other copies
+
+    copies = []
+    visited = set()
+    stack = list(restored)
+
+    while stack:
+        category, datablock = stack.pop()
+
+        if category not in index.owner_categories:
+            continue
+
+        for reference in index.collect_references(category, datablock):
+            copy = getattr(bpy.data, reference[0]).get(reference[1])
+
+            if copy is None or copy.as_pointer() in visited or \
+                    copy_property not in copy:
+                continue
+
+            visited.add(copy.as_pointer())
+            copies.append((reference[0], copy))
+            stack.append((reference[0], copy))
+
+    return copies
+
+
+def restore(snapshot):
+    # appends the removed data-blocks in the snapshot back into the
+    # project, remaps the users of the copies of the data-blocks they use
+    # to the originals and points the remaining data-blocks that used them
+    # back at them
+
+    with bpy.data.libraries.load(snapshot.filepath, link=False) as \
+            (data_from, data_to):
+        for category, keys in snapshot.removed.items():
+            setattr(data_to, category, list(keys))
+
+    # the data-blocks that were asked for are loaded in the same order
+    restored = {}
+    for category, keys in snapshot.removed.items():
+        for key, datablock in zip(keys, getattr(data_to, category)):
+            if datablock is not None:
+                restored[(category, key)] = datablock
+                datablock.use_fake_user = \
+                    (category, key) in snapshot.fake_users
+
+    # the copies of data-blocks that still exist are replaced by the
+    # originals, and copies whose original was removed since are kept
+    removals = []
+    for category, copy in find_copies(
+            [(reference[0], datablock)
+             for reference, datablock in restored.items()]):
+        original = find_original(
+            *snapshot.originals[copy[copy_property]])
+
+        if original is None:
+            del copy[copy_property]
+        else:
+            copy.user_remap(original)
+            removals.append((category, copy))
+
+    # bpy.data.batch_remove() is not available before Blender 2.81
+    if hasattr(bpy.data, 'batch_remove'):
+        bpy.data.batch_remove([copy for _, copy in removals])
+    else:
+        for category, copy in removals:
+            getattr(bpy.data, category).remove(copy)
+
+    # point the remaining data-blocks back at the restored data-blocks
+    for (category, key), path, reference in snapshot.users:
+        owner = getattr(bpy.data, category).get(key)
+
+        if owner is not None and reference in restored:
+            reassign(owner, path, restored[reference])
+
+    index.invalidate()
+
+
+def undo():
+    # restores the data-blocks of the latest removal operation and
+    # returns the number of data-blocks restored or None if there is
+    # nothing to restore
+
+    while operations and not operations[-1]:
+        operations.pop()
+
+    if not operations:
+        return None
+
+    restored = 0
+
+    for snapshot in reversed(operations.pop()):
+        restore(snapshot)
+        restored += sum(map(len, snapshot.removed.values()))
+
+        delete(snapshot)
+
+    return restored
+
+
+def clear(*args):
+    # discards every snapshot and deletes their temporary files
+
+    global snapshot_directory
+    global snapshot_count
+
+    operations.clear()
+
+    if snapshot_directory is not None:
+        shutil.rmtree(snapshot_directory, ignore_errors=True)
+        snapshot_directory = None
+        snapshot_count = 0
+
+
+@persistent
+def clear_handler(*args):
+    # snapshots cannot be restored into another file or after a global
+    # undo step may have already restored the data-blocks in them
+    clear()
+
+
+def register():
+    bpy.app.handlers.load_pre.append(clear_handler)
+    bpy.app.handlers.undo_post.append(clear_handler)
+    bpy.app.handlers.redo_post.append(clear_handler)
+
+
+def unregister():
+    bpy.app.handlers.load_pre.remove(clear_handler)
+    bpy.app.handlers.undo_post.remove(clear_handler)
+    bpy.app.handlers.redo_post.remove(clear_handler)
+    clear()
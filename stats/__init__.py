@@ -0,0 +1,42 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file handles the registration of the atomic_data_manager.stats package
+
+"""
+
+
+from atomic_data_manager.stats import index
+from atomic_data_manager.stats import background
+from atomic_data_manager.stats import missing
+from atomic_data_manager.stats import snapshot
+
+
+def register():
+    index.register()
+    background.register()
+    snapshot.register()
+
+
+def unregister():
+    index.unregister()
+    background.unregister()
+    snapshot.unregister()
+    missing.shutdown()
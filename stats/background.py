@@ -0,0 +1,261 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains functions that run resumable scans in the background
+so that scanning a large project does not freeze Blender's interface.
+
+A scan is a generator that yields the fraction of its work that is done
+after each step, such as the steps of stats.unused.scan_steps(). The
+scan is driven by a bpy.app.timers timer that runs as many steps as fit
+in a short time slice per tick. When the scan finishes, the operator
+that started it is invoked again and takes the value the scan returned
+from result().
+
+"""
+
+import bpy
+import time
+from bpy.app.handlers import persistent
+
+
+# the longest time in seconds that a scan may run per timer tick
+time_slice = 0.05
+
+# the time in seconds between timer ticks, which gives Blender time to
+# handle events and redraw its interface
+tick_interval = 0.01
+
+
+# Atomic Data Manager Background Scan
+class BackgroundScan:
+    # a scan that is running in the background on behalf of an operator
+
+    def __init__(self, steps, operator, window, area):
+
+        # the scan's generator
+        self.steps = steps
+
+        # the fraction of the scan's work that is done
+        self.progress = 0.0
+
+        # the value the scan's generator returned when it finished
+        self.result = None
+
+        # the bl_idname of the operator to invoke when the scan finishes
+        self.operator = operator
+
+        # the window and area that the operator was invoked from
+        self.window = window
+        self.area = area
+
+
+# the scan that is running in the background or None if there is no scan
+background_scan = None
+
+# the finished scan whose operator is being invoked again
+finished_scan = None
+
+# the value returned by the last scan that run() finished
+finished_result = None
+
+
+def run(context, operator, steps):
+    # runs the steps for a single time slice and returns true if they
+    # finished, in which case their return value is available from
+    # result(). otherwise, the steps keep running in the background and
+    # the operator is invoked again when they finish
+
+    global background_scan
+    global finished_scan
+    global finished_result
+
+    # the operator is being invoked again by the scan it started, so the
+    # scan's result is used instead of running the new steps. the result
+    # is only used once, so an operator that finds it stale can run new
+    # steps by calling run() again
+    if finished_scan is not None and finished_scan.operator == operator:
+        steps.close()
+        finished_result = finished_scan.result
+        finished_scan = None
+        return True
+
+    # a new scan replaces any scan that is already running
+    cancel()
+
+    scan = BackgroundScan(steps, operator, context.window, context.area)
+
+    if advance(scan):
+        finished_result = scan.result
+        return True
+
+    background_scan = scan
+    context.window_manager.progress_begin(0, 100)
+    bpy.app.timers.register(tick, first_interval=tick_interval)
+    redraw()
+
+    return False
+
+
+def advance(scan):
+    # runs the scan's steps until the time slice is used up and returns
+    # true if the scan finished
+
+    deadline = time.perf_counter() + time_slice
+
+    while True:
+        try:
+            scan.progress = next(scan.steps)
+        except StopIteration as stop:
+            scan.result = stop.value
+            return True
+
+        if time.perf_counter() > deadline:
+            return False
+
+
+def tick():
+    # advances the background scan and returns the time until the next
+    # tick or None to stop the timer once the scan finishes
+
+    global background_scan
+
+    scan = background_scan
+
+    if scan is None:
+        return None
+
+    finished = True
+
+    # the scan is over once it finishes or raises an error
+    try:
+        finished = advance(scan)
+    finally:
+        if finished:
+            background_scan = None
+            bpy.context.window_manager.progress_end()
+            redraw()
+
+    if not finished:
+        bpy.context.window_manager.progress_update(int(scan.progress * 100))
+        redraw()
+        return tick_interval
+
+    invoke(scan)
+    return None
+
+
+def invoke(scan):
+    # invokes the operator that started the scan from the window and
+    # area it was started in, if they still exist
+
+    global finished_scan
+
+    window_manager = bpy.context.window_manager
+
+    if scan.window not in window_manager.windows[:]:
+        return
+
+    override = {'window': scan.window, 'screen': scan.window.screen}
+
+    if scan.area in scan.window.screen.areas[:]:
+        override['area'] = scan.area
+
+    module, name = scan.operator.split(".")
+    operator = getattr(getattr(bpy.ops, module), name)
+
+    # the operator takes the scan's result when it calls run() again
+    finished_scan = scan
+
+    try:
+        invoke_with_override(operator, override)
+    finally:
+        finished_scan = None
+
+
+def invoke_with_override(operator, override):
+    # invokes the operator with the context members in the override
+    # dictionary replaced
+
+    # context overrides are passed as a dictionary before Blender 3.2,
+    # which Blender 4.0 no longer accepts
+    if hasattr(bpy.context, 'temp_override'):
+        with bpy.context.temp_override(**override):
+            operator('INVOKE_DEFAULT')
+
+    else:
+        operator(override, 'INVOKE_DEFAULT')
+
+
+def cancel():
+    # stops the background scan without invoking its operator
+
+    global background_scan
+
+    if bpy.app.timers.is_registered(tick):
+        bpy.app.timers.unregister(tick)
+
+    if background_scan is not None:
+        background_scan.steps.close()
+        background_scan = None
+        bpy.context.window_manager.progress_end()
+        redraw()
+
+
+def result():
+    # returns the value returned by the steps of the last scan that run()
+    # reported as finished
+    return finished_result
+
+
+def progress():
+    # returns the fraction of the background scan's work that is done or
+    # None if there is no background scan
+    return background_scan.progress if background_scan else None
+
+
+def redraw():
+    # redraws the properties editors that display the main panel's
+    # progress indicator
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
+
+
+@persistent
+def cancel_handler(*args):
+    # cancels the background scan when a new file is loaded or an undo or
+    # redo replaces the project's data, since the data-blocks it was
+    # scanning no longer exist
+    cancel()
+
+
+def register():
+    bpy.app.handlers.load_pre.append(cancel_handler)
+    bpy.app.handlers.undo_post.append(cancel_handler)
+    bpy.app.handlers.redo_post.append(cancel_handler)
+
+
+def unregister():
+    bpy.app.handlers.load_pre.remove(cancel_handler)
+    bpy.app.handlers.undo_post.remove(cancel_handler)
+    bpy.app.handlers.redo_post.remove(cancel_handler)
+    cancel()
@@ -0,0 +1,634 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains a reader for .blend files that lists the data-blocks
+in a file without starting Blender, so large archives of files can be
+audited from a plain Python interpreter.
+
+The reader walks the file's block headers once. Uncompressed files are
+memory-mapped so the contents of blocks that are not needed are skipped
+without being read, and gzip and zstd compressed files are decompressed
+as a stream. Only the start of each data-block is kept, and its name,
+users and flags are decoded with the field offsets that the file's SDNA
+gives for Blender's ID struct.
+
+This file does not import bpy or the rest of the add-on, other than the
+shared predicates in stats/predicates.py, which do not import bpy
+either. It can be run as a script to print the inventory and counts of
+each file passed to it:
+
+    python blendfile.py file.blend [file.blend ...]
+
+"""
+
+import gzip
+import mmap
+import os
+import re
+import struct
+import sys
+
+# the predicates are imported from the same directory when this file is
+# run as a script rather than imported as part of the add-on
+if __package__:
+    from atomic_data_manager.stats import predicates
+else:
+    import predicates
+
+# zstd compressed files are written by Blender 3.0 and later and are
+# only readable if a zstd module is available
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# the categories of data-blocks keyed by the two character code of their
+# blocks, named after their collections in bpy.data
+id_categories = {
+    b"AC": 'actions',
+    b"AR": 'armatures',
+    b"BR": 'brushes',
+    b"CA": 'cameras',
+    b"CF": 'cache_files',
+    b"CU": 'curves',
+    b"CV": 'hair_curves',
+    b"GD": 'grease_pencils',
+    b"GP": 'grease_pencils_v3',
+    b"GR": 'collections',
+    b"IM": 'images',
+    b"KE": 'shape_keys',
+    b"LA": 'lights',
+    b"LI": 'libraries',
+    b"LP": 'lightprobes',
+    b"LS": 'linestyles',
+    b"LT": 'lattices',
+    b"MA": 'materials',
+    b"MB": 'metaballs',
+    b"MC": 'movieclips',
+    b"ME": 'meshes',
+    b"MS": 'masks',
+    b"NT": 'node_groups',
+    b"OB": 'objects',
+    b"PA": 'particles',
+    b"PC": 'paint_curves',
+    b"PL": 'palettes',
+    b"PT": 'pointclouds',
+    b"SC": 'scenes',
+    b"SK": 'speakers',
+    b"SO": 'sounds',
+    b"SR": 'screens',
+    b"TE": 'textures',
+    b"TX": 'texts',
+    b"VF": 'fonts',
+    b"VO": 'volumes',
+    b"WM": 'window_managers',
+    b"WO": 'worlds',
+    b"WS": 'workspaces',
+}
+
+# the code of the blocks that stand in for data-blocks linked indirectly
+# from other files, whose type is given by the first two characters of
+# their names
+placeholder_code = b"ID\0\0"
+
+# the codes of the blocks that do not belong to the data-block before them
+file_codes = frozenset([
+    b"DNA1",
+    b"ENDB",
+    b"GLOB",
+    b"REND",
+    b"TEST",
+    b"USER",
+])
+
+# the ID flag that is set when a data-block has a fake user
+fake_user_flag = 1 << 9
+
+# the bytes that are kept from the start of each data-block, which must
+# cover Blender's ID struct
+id_prefix_bytes = 2048
+
+# the number of bytes that are read at a time when skipping through a
+# compressed file
+skip_chunk_bytes = 1 << 20
+
+class BlendFileError(Exception):
+    # raised when a file is not a .blend file or cannot be read
+    pass
+
+
+# Atomic Data Manager Blend File ID
+class BlendID:
+    # a data-block read from a .blend file, with the attributes of its
+    # counterpart in bpy.data that Atomic's counts rely on
+
+    __slots__ = (
+        'category',
+        'name',
+        'users',
+        'use_fake_user',
+        'library',
+        'size',
+        'packed_size',
+    )
+
+    def __init__(self, category, name, users, use_fake_user, library, size,
+                 packed_size=0):
+        # the bpy.data collection that the data-block belongs to
+        self.category = category
+
+        # the name of the data-block without its type code
+        self.name = name
+
+        # the number of users the data-block had when the file was saved
+        self.users = users
+
+        # whether the data-block has a fake user
+        self.use_fake_user = use_fake_user
+
+        # the address of the data-block's library or None if it is local
+        self.library = library
+
+        # the bytes the data-block and the blocks it owns take up in the
+        # uncompressed file
+        self.size = size
+
+        # the bytes of the data-block's size that are packed files
+        self.packed_size = packed_size
+
+    def __contains__(self, key):
+        # custom properties are not read, so no data-block is tagged
+        return False
+
+    def __repr__(self):
+        return "<BlendID {0} '{1}'>".format(self.category, self.name)
+
+
+# Atomic Data Manager Blend File
+class BlendFile:
+    # the data-blocks of a .blend file, read when the file is opened
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+        # the version of Blender that saved the file, such as 280
+        self.version = 0
+
+        # the size in bytes of pointers in the file
+        self.pointer_size = 8
+
+        # whether the file's numbers are little endian
+        self.little_endian = True
+
+        # whether the file is gzip or zstd compressed
+        self.compressed = False
+
+        # every data-block in the file in the order they were saved
+        self.ids = []
+
+        # the data-blocks in the file keyed by their categories
+        self.data = {}
+
+        stream = open_stream(filepath)
+
+        try:
+            self.compressed = not isinstance(stream, mmap.mmap)
+            self.read(stream)
+        finally:
+            stream.close()
+
+        for datablock in self.ids:
+            self.data.setdefault(datablock.category, []).append(datablock)
+
+    def read(self, stream):
+        # reads the header and blocks of the file from the stream
+
+        large_heads = self.read_header(stream)
+
+        if large_heads:
+            head_format = "4siQqq"
+        elif self.pointer_size == 8:
+            head_format = "4siQii"
+        else:
+            head_format = "4siIii"
+
+        head = struct.Struct(self.endian() + head_format)
+
+        # the data-blocks are decoded once the SDNA at the end of the file
+        # has been read, so the start of each one is kept until then
+        pending = []
+        sdna = None
+
+        while True:
+            fields = head.unpack(read_exact(stream, head.size))
+
+            if large_heads:
+                code, sdna_index, _, length, _ = fields
+            else:
+                code, length, _, sdna_index, _ = fields
+
+            if code == b"ENDB":
+                break
+
+            if code == b"DNA1":
+                sdna = read_exact(stream, length)
+
+            elif is_id_code(code):
+                prefix = read_exact(stream, min(length, id_prefix_bytes))
+                skip(stream, length - len(prefix))
+                pending.append([code, prefix, head.size + length, []])
+
+            else:
+                skip(stream, length)
+
+                # blocks that are not data-blocks belong to the data-block
+                # that was saved before them
+                if pending and code not in file_codes:
+                    pending[-1][2] += head.size + length
+                    pending[-1][3].append((sdna_index, head.size + length))
+
+        if sdna is None:
+            raise BlendFileError(
+                "{0} has no SDNA block".format(self.filepath))
+
+        structs = parse_sdna(sdna, self.endian(), self.pointer_size)
+        decode = self.id_decoder(structs['ID'])
+
+        # the contents of a packed file are saved in the block after its
+        # PackedFile struct
+        packed_index = list(structs).index('PackedFile') \
+            if 'PackedFile' in structs else None
+
+        for code, prefix, size, owned in pending:
+            datablock = decode(code, prefix, size)
+
+            for index in range(1, len(owned)):
+                if owned[index - 1][0] == packed_index:
+                    datablock.packed_size += owned[index][1]
+
+            self.ids.append(datablock)
+
+    def read_header(self, stream):
+        # reads the file header and returns whether the file uses the
+        # large block headers of Blender 5.0 and later
+
+        header = read_exact(stream, 12)
+
+        if header[:7] != b"BLENDER":
+            raise BlendFileError(
+                "{0} is not a .blend file".format(self.filepath))
+
+        # the header of files saved by Blender 5.0 and later starts with
+        # its own size, such as BLENDER17-01v0500
+        if header[7:9].isdigit():
+            header_size = int(header[7:9])
+            header += read_exact(stream, header_size - len(header))
+            pointer_char = header[9:10]
+            endian_char = header[12:13]
+            self.version = int(header[13:17])
+            large_heads = int(header[10:12]) >= 1
+
+        else:
+            pointer_char = header[7:8]
+            endian_char = header[8:9]
+            self.version = int(header[9:12])
+            large_heads = False
+
+        self.pointer_size = 8 if pointer_char == b"-" else 4
+        self.little_endian = endian_char == b"v"
+
+        return large_heads
+
+    def endian(self):
+        # returns the struct module's byte order character for the file
+        return "<" if self.little_endian else ">"
+
+    def id_decoder(self, layout):
+        # returns a function that decodes the start of a data-block into a
+        # BlendID using the layout of the ID struct in the file's SDNA
+
+        name_offset, name_size = layout['name']
+        us_offset, us_size = layout['us']
+        flag_offset, flag_size = layout['flag']
+        lib_offset, lib_size = layout['lib']
+
+        us = struct.Struct(self.endian() + integer_format(us_size))
+        flag = struct.Struct(self.endian() + integer_format(flag_size))
+        lib = struct.Struct(
+            self.endian() + integer_format(lib_size).upper())
+
+        def decode(code, prefix, size):
+            raw_name = prefix[name_offset:name_offset + name_size]
+            name = raw_name.split(b"\0", 1)[0].decode('utf-8', 'replace')
+
+            # the first two characters of an ID name are its type code
+            type_code = name[:2].encode() if code == placeholder_code \
+                else code[:2]
+
+            library = lib.unpack_from(prefix, lib_offset)[0]
+
+            return BlendID(
+                category=id_categories.get(type_code, 'unknown'),
+                name=name[2:],
+                users=us.unpack_from(prefix, us_offset)[0],
+                use_fake_user=bool(
+                    flag.unpack_from(prefix, flag_offset)[0] &
+                    fake_user_flag),
+                library=library if library else None,
+                size=size
+            )
+
+        return decode
+
+    def collection(self, category):
+        # returns a list of the data-blocks in the category
+        return self.data.get(category, [])
+
+    def size(self):
+        # returns the bytes all of the data-blocks take up in the
+        # uncompressed file
+        return sum(datablock.size for datablock in self.ids)
+
+    def category_sizes(self):
+        # returns a dictionary that maps each category to the bytes its
+        # data-blocks take up in the uncompressed file, with the contents
+        # of packed files counted under 'packed_files' instead of the
+        # data-blocks they are packed into
+
+        sizes = {}
+
+        for datablock in self.ids:
+            sizes[datablock.category] = sizes.get(datablock.category, 0) + \
+                datablock.size - datablock.packed_size
+
+            if datablock.packed_size:
+                sizes['packed_files'] = sizes.get('packed_files', 0) + \
+                    datablock.packed_size
+
+        return sizes
+
+
+def is_id_code(code):
+    # returns true if a block with the code starts a data-block
+    return code == placeholder_code or \
+        (code[2:] == b"\0\0" and code[:2] in id_categories)
+
+
+def integer_format(size):
+    # returns the struct module's format character for a signed integer
+    # of the specified size in bytes
+    return {1: "b", 2: "h", 4: "i", 8: "q"}[size]
+
+
+def open_stream(filepath):
+    # returns a readable stream of the uncompressed contents of the file,
+    # which is a memory map if the file is not compressed
+
+    with open(filepath, 'rb') as file:
+        magic = file.read(4)
+
+        if magic[:2] == b"\x1f\x8b":
+            return gzip.open(filepath, 'rb')
+
+        if magic == b"\x28\xb5\x2f\xfd":
+            if zstd is not None:
+                return zstd.open(filepath, 'rb')
+
+            if zstandard is not None:
+                return zstandard.ZstdDecompressor().stream_reader(
+                    open(filepath, 'rb'), closefd=True,
+                    read_across_frames=True)
+
+            raise BlendFileError(
+                "{0} is zstd compressed, which requires the zstandard "
+                "module".format(filepath))
+
+        # the map stays valid after the file is closed. empty files
+        # cannot be mapped
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise BlendFileError("{0} is empty".format(filepath))
+
+
+def read_exact(stream, size):
+    # reads exactly the specified number of bytes from the stream
+
+    data = stream.read(size)
+
+    # decompressing streams may return fewer bytes than were requested
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+
+        if not chunk:
+            raise BlendFileError("unexpected end of file")
+
+        data += chunk
+
+    return data
+
+
+def skip(stream, size):
+    # moves the stream forward by the specified number of bytes
+
+    # memory maps refuse to seek past their end
+    if isinstance(stream, mmap.mmap):
+        try:
+            stream.seek(size, os.SEEK_CUR)
+        except ValueError:
+            raise BlendFileError("unexpected end of file")
+        return
+
+    while size > 0:
+        chunk = stream.read(min(size, skip_chunk_bytes))
+
+        if not chunk:
+            raise BlendFileError("unexpected end of file")
+
+        size -= len(chunk)
+
+
+def parse_sdna(sdna, endian, pointer_size):
+    # returns a dictionary that maps the name of each struct in the SDNA
+    # to a dictionary of the offsets and sizes of its fields, in the order
+    # of the struct indices that block headers refer to
+
+    position = 0
+
+    def take(expected):
+        nonlocal position
+
+        # every section starts on a four byte boundary
+        position = (position + 3) & ~3
+
+        if sdna[position:position + 4] != expected:
+            raise BlendFileError("malformed SDNA block")
+
+        position += 4
+
+    def integers(fmt, count):
+        nonlocal position
+
+        values = struct.unpack_from(endian + fmt * count, sdna, position)
+        position += struct.calcsize(endian + fmt * count)
+
+        return values
+
+    def strings():
+        nonlocal position
+
+        strings = []
+
+        for _ in range(integers("i", 1)[0]):
+            end = sdna.index(b"\0", position)
+            strings.append(sdna[position:end].decode('ascii'))
+            position = end + 1
+
+        return strings
+
+    take(b"SDNA")
+    take(b"NAME")
+    names = strings()
+    take(b"TYPE")
+    types = strings()
+    take(b"TLEN")
+    type_sizes = integers("h", len(types))
+    take(b"STRC")
+
+    structs = {}
+
+    for _ in range(integers("i", 1)[0]):
+        struct_type, field_count = integers("h", 2)
+        fields = integers("h", field_count * 2)
+
+        offset = 0
+        layout = {}
+
+        for index in range(field_count):
+            field_type = fields[index * 2]
+            field_name = names[fields[index * 2 + 1]]
+
+            size = field_size(field_name, type_sizes[field_type],
+                              pointer_size)
+
+            layout[bare_name(field_name)] = (offset, size)
+            offset += size
+
+        structs[types[struct_type]] = layout
+
+    return structs
+
+
+def field_size(name, type_size, pointer_size):
+    # returns the size in bytes of an SDNA field, such as *next or
+    # name[66]
+
+    count = 1
+    for dimension in re.findall(r"\[(\d+)\]", name):
+        count *= int(dimension)
+
+    if name.startswith("*") or name.startswith("(*"):
+        return pointer_size * count
+
+    return type_size * count
+
+
+def bare_name(name):
+    # returns the name of an SDNA field without its pointer and array
+    # syntax
+    return re.match(r"\(?\**(\w+)", name).group(1)
+
+
+def shallow(datablocks, include_fake_users=False):
+    # returns a list of names of unused data-blocks, found with the same
+    # shallow check as stats/unused.py
+
+    excluded = predicates.compile_rules(
+        names=predicates.builtin_names,
+        fake_users=not include_fake_users
+    )
+
+    return predicates.shallow(datablocks, excluded)
+
+
+def count(blend_file, category):
+    # returns the number of data-blocks in the category
+    return len(blend_file.collection(category))
+
+
+def count_unused(blend_file, category, include_fake_users=False):
+    # returns the number of unused data-blocks in the category
+    return len(shallow(blend_file.collection(category), include_fake_users))
+
+
+def inventory(blend_file):
+    # returns a list of lines describing every data-block in the file
+
+    lines = []
+
+    for category in sorted(blend_file.data):
+        lines.append("{0} ({1} total, {2} unused)".format(
+            category,
+            count(blend_file, category),
+            count_unused(blend_file, category)
+        ))
+
+        for datablock in blend_file.collection(category):
+            lines.append("    {0:<40} {1:>10} B  users: {2}{3}{4}".format(
+                datablock.name,
+                datablock.size,
+                datablock.users,
+                "  fake user" if datablock.use_fake_user else "",
+                "  linked" if datablock.library else ""
+            ))
+
+    return lines
+
+
+def main(filepaths):
+    # prints the inventory of each file and returns an exit status
+
+    status = 0
+
+    for filepath in filepaths:
+        try:
+            blend_file = BlendFile(filepath)
+        except (BlendFileError, OSError) as error:
+            print("{0}: {1}".format(filepath, error), file=sys.stderr)
+            status = 1
+            continue
+
+        print("{0} (Blender {1}, {2} data-blocks)".format(
+            filepath, blend_file.version, len(blend_file.ids)))
+
+        for line in inventory(blend_file):
+            print(line)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,61 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains the rules that exclude data-blocks from Atomic's
+unused and missing data detection.
+
+The rules are compiled by stats/predicates.py into a single predicate
+that returns true if a data-block is excluded. Names are checked against
+a frozenset and all of the name prefixes are combined into one regular
+expression. A compiled predicate is reused until the preferences it was
+compiled from change.
+
+"""
+
+from atomic_data_manager import config
+from atomic_data_manager.stats import predicates
+
+
+def prefixes():
+    # returns a tuple of the name prefixes in Atomic's preferences
+    return tuple(prefix.strip() for prefix in
+                 config.exclude_prefixes.split(",") if prefix.strip())
+
+
+def unused_rules():
+    # returns the predicate for data-blocks that should never be flagged
+    # as unused, which also protects the data-blocks they use
+    return predicates.compile_rules(
+        names=predicates.builtin_names,
+        prefixes=prefixes(),
+        linked=config.exclude_linked_data,
+        fake_users=not config.include_fake_users,
+        tagged=config.exclude_tagged_data
+    )
+
+
+def missing_rules():
+    # returns the predicate for data-blocks that should never be flagged
+    # as missing
+    return predicates.compile_rules(
+        names=predicates.builtin_names,
+        prefixes=prefixes(),
+        tagged=config.exclude_tagged_data
+    )
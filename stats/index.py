@@ -0,0 +1,1339 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains the reference index that stats.users.py looks up the
+users of data-blocks in and that stats.unused.py finds unreachable
+data-blocks with.
+
+The index walks every scene, collection, object, node tree, material
+slot, modifier, constraint, particle texture slot, brush and animated
+data-block in the project exactly once and records the data-blocks that
+each of them references. It then inverts those references into a map
+from each data-block to the data-blocks that use it, so finding the
+users of a data-block is a dictionary lookup rather than another walk
+through bpy.data.
+
+Data-blocks are identified by (category, key) tuples, where the category
+is the name of the bpy.data collection the data-block lives in.
+
+e.g. An image named "Wood" is identified by ('images', "Wood").
+
+The references can come from one of two backends, chosen in Atomic's
+preferences. The Atomic walker collects them with the functions in this
+file. The native backend takes them from Blender's bpy.data.user_map(),
+which is computed in C, and only walks scene compositors on top of it.
+compare() diffs the two so the native backend can be checked.
+
+Once built, the index is kept up to date by patching the owners that the
+depsgraph reports as updated, other than those that were only moved.
+Loading a file, undoing, redoing, renaming data-blocks and retargeting
+constraints throw the index away so it is rebuilt from scratch.
+
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+from atomic_data_manager import config
+
+
+def animation_references(datablock, references):
+    # adds the actions used by the data-block's animation data, including
+    # the actions in its NLA strips, to the set of references
+
+    animation_data = getattr(datablock, 'animation_data', None)
+
+    if animation_data is None:
+        return
+
+    if animation_data.action:
+        references.add(('actions', animation_data.action.name))
+
+    for track in animation_data.nla_tracks:
+        for strip in track.strips:
+            if strip.action:
+                references.add(('actions', strip.action.name))
+
+
+# the identifiers of the writable pointer properties of each struct type,
+# gathered the first time a struct of the type is walked
+pointer_properties = {}
+
+# the category of each python type of data-block, or None if the index
+# does not identify data-blocks of the type
+pointer_categories = {}
+
+
+def datablock_reference(value, references):
+    # adds the value to the set of references if it is a data-block of
+    # one of the index's categories
+
+    if not isinstance(value, bpy.types.ID):
+        return
+
+    value_type = type(value)
+
+    if value_type not in pointer_categories:
+        pointer_categories[value_type] = \
+            type_category(value, category_types)
+
+    category = pointer_categories[value_type]
+
+    if category is not None:
+        references.add((category, value.name))
+
+
+def pointer_references(struct, references):
+    # adds every data-block that one of the struct's writable pointer
+    # properties points at to the set of references, so pointers such as
+    # a node's font or material or a modifier's collection are found
+    # without listing the attributes of every type of struct
+
+    struct_type = type(struct)
+
+    if struct_type not in pointer_properties:
+        pointer_properties[struct_type] = [
+            prop.identifier for prop in struct.bl_rna.properties
+            if prop.type == 'POINTER' and not prop.is_readonly
+        ]
+
+    for identifier in pointer_properties[struct_type]:
+        datablock_reference(getattr(struct, identifier, None), references)
+
+
+def node_tree_references(node_tree, references):
+    # adds the data-blocks used by the nodes in the node tree and the
+    # actions that animate it to the set of references
+
+    animation_references(node_tree, references)
+
+    for node in node_tree.nodes:
+
+        # the data-blocks the node points at, such as its image, texture,
+        # node group, font or material
+        pointer_references(node, references)
+
+        # the data-blocks picked in the node's inputs, such as the object
+        # of an object info node
+        for socket in node.inputs:
+            datablock_reference(
+                getattr(socket, 'default_value', None), references)
+
+
+def collection_references(collection, references):
+    # adds the child collections and objects in the collection to the set
+    # of references
+
+    for child in collection.children:
+        references.add(('collections', child.name))
+
+    for obj in collection.objects:
+        references.add(('objects', obj.name))
+
+
+def node_group_references(node_group, references):
+    # adds the data-blocks used by the node group to the set of references
+    node_tree_references(node_group, references)
+
+
+def material_references(material, references):
+    # adds the data-blocks used by the material to the set of references
+
+    animation_references(material, references)
+
+    # if material uses a valid node tree
+    if material.use_nodes and material.node_tree:
+        node_tree_references(material.node_tree, references)
+
+
+def world_references(world, references):
+    # adds the data-blocks used by the world to the set of references
+
+    animation_references(world, references)
+
+    # if world uses a valid node tree
+    if world.use_nodes and world.node_tree:
+        node_tree_references(world.node_tree, references)
+
+
+def texture_references(texture, references):
+    # adds the data-blocks used by the texture to the set of references
+
+    animation_references(texture, references)
+
+    # if texture uses a valid node tree
+    if texture.use_nodes and texture.node_tree:
+        node_tree_references(texture.node_tree, references)
+
+    # otherwise check the texture's image attribute
+    elif hasattr(texture, 'image') and texture.image:
+        references.add(('images', texture.image.name))
+
+
+def scene_references(scene, references):
+    # adds the data-blocks used by the scene to the set of references
+
+    # collections and objects linked to the scene's master collection
+    collection_references(scene.collection, references)
+
+    # the scene's world
+    if scene.world:
+        references.add(('worlds', scene.world.name))
+
+    # if the compositor uses nodes and has a valid node tree
+    if scene.use_nodes and scene.node_tree:
+        node_tree_references(scene.node_tree, references)
+
+    # sounds and fonts used by the sequencer's strips
+    if scene.sequence_editor:
+        for strip in scene.sequence_editor.sequences_all:
+            if getattr(strip, 'sound', None):
+                references.add(('sounds', strip.sound.name))
+
+            # text strips in newer versions of Blender
+            if getattr(strip, 'font', None):
+                references.add(('fonts', strip.font.name))
+
+    animation_references(scene, references)
+
+
+def light_references(light, references):
+    # adds the data-blocks used by the light's node tree to the set of
+    # references
+
+    # if light uses a valid node tree
+    if light.use_nodes and light.node_tree:
+        node_tree_references(light.node_tree, references)
+
+    animation_references(light, references)
+
+
+# the bpy.data categories of the data used by each type of object
+object_data_categories = {
+    'ARMATURE': 'armatures',
+    'CAMERA': 'cameras',
+    'CURVE': 'curves',
+    'EMPTY': 'images',
+    'FONT': 'curves',
+    'GPENCIL': 'grease_pencils',
+    'LATTICE': 'lattices',
+    'LIGHT': 'lights',
+    'LIGHT_PROBE': 'lightprobes',
+    'MESH': 'meshes',
+    'META': 'metaballs',
+    'SPEAKER': 'speakers',
+    'SURFACE': 'curves',
+}
+
+
+def object_references(obj, references):
+    # adds the data-blocks used by the object to the set of references
+
+    # object data used by the object
+    if obj.data and obj.type in object_data_categories:
+        references.add((object_data_categories[obj.type], obj.data.name))
+
+    # collection instanced by the object
+    if obj.instance_collection:
+        references.add(('collections', obj.instance_collection.name))
+
+    # materials in the object's material slots
+    if hasattr(obj, 'material_slots'):
+        for slot in obj.material_slots:
+            if slot.material:
+                references.add(('materials', slot.material.name))
+
+    # particle systems used by the object
+    if hasattr(obj, 'particle_systems'):
+        for particle in obj.particle_systems:
+            if particle.settings:
+                references.add(('particles', particle.settings.name))
+
+    # data-blocks used by the object's modifiers, such as textures,
+    # objects, collections and node groups
+    if hasattr(obj, 'modifiers'):
+        for modifier in obj.modifiers:
+            pointer_references(modifier, references)
+
+            # the inputs of a geometry nodes modifier are stored as id
+            # properties of the modifier
+            if modifier.type == 'NODES':
+                for key in modifier.keys():
+                    datablock_reference(modifier[key], references)
+
+    # data-blocks used by the object's constraints and by the
+    # constraints of its pose bones
+    if hasattr(obj, 'constraints'):
+        constraint_references(obj.constraints, references)
+
+    if getattr(obj, 'pose', None):
+        for bone in obj.pose.bones:
+            constraint_references(bone.constraints, references)
+
+    # actions that animate the object
+    animation_references(obj, references)
+
+
+def constraint_references(constraints, references):
+    # adds the data-blocks used by the constraints, such as the objects
+    # they target and the actions of action constraints, to the set of
+    # references
+
+    for constraint in constraints:
+        pointer_references(constraint, references)
+
+
+def particle_references(particle, references):
+    # adds the textures in the particle system's texture slots and the
+    # data-blocks it instances to the set of references
+
+    for texture_slot in particle.texture_slots:
+        if hasattr(texture_slot, 'texture') and texture_slot.texture:
+            references.add(('textures', texture_slot.texture.name))
+
+    # the object or collection the particle system instances
+    if particle.instance_object:
+        references.add(('objects', particle.instance_object.name))
+
+    if particle.instance_collection:
+        references.add(
+            ('collections', particle.instance_collection.name))
+
+    animation_references(particle, references)
+
+
+def brush_references(brush, references):
+    # adds the brush's texture to the set of references
+
+    if brush.texture:
+        references.add(('textures', brush.texture.name))
+
+
+def mesh_references(mesh, references):
+    # adds the materials of the mesh and the actions that animate it or
+    # its shape keys to the set of references
+
+    for material in mesh.materials:
+        if material:
+            references.add(('materials', material.name))
+
+    if mesh.shape_keys:
+        animation_references(mesh.shape_keys, references)
+
+    animation_references(mesh, references)
+
+
+def curve_references(curve, references):
+    # adds the materials of the curve, the data-blocks it points at, such
+    # as its bevel and taper objects and the fonts of a text curve, and
+    # the actions that animate it or its shape keys to the set of
+    # references
+
+    for material in curve.materials:
+        if material:
+            references.add(('materials', material.name))
+
+    pointer_references(curve, references)
+
+    if curve.shape_keys:
+        animation_references(curve.shape_keys, references)
+
+    animation_references(curve, references)
+
+
+def lattice_references(lattice, references):
+    # adds the actions that animate the lattice or its shape keys to the
+    # set of references
+
+    if lattice.shape_keys:
+        animation_references(lattice.shape_keys, references)
+
+    animation_references(lattice, references)
+
+
+def material_user_references(datablock, references):
+    # adds the materials of a metaball or grease pencil and the actions
+    # that animate it to the set of references
+
+    for material in datablock.materials:
+        if material:
+            references.add(('materials', material.name))
+
+    animation_references(datablock, references)
+
+
+def linestyle_references(linestyle, references):
+    # adds the data-blocks used by the line style's node tree and the
+    # actions that animate it to the set of references
+
+    if linestyle.use_nodes and linestyle.node_tree:
+        node_tree_references(linestyle.node_tree, references)
+
+    animation_references(linestyle, references)
+
+
+def speaker_references(speaker, references):
+    # adds the speaker's sound and the actions that animate it to the set
+    # of references
+
+    if speaker.sound:
+        references.add(('sounds', speaker.sound.name))
+
+    animation_references(speaker, references)
+
+
+# the categories of data-blocks that reference other data-blocks and the
+# functions that collect their references
+owner_categories = {
+    'collections': collection_references,
+    'node_groups': node_group_references,
+    'materials': material_references,
+    'worlds': world_references,
+    'textures': texture_references,
+    'scenes': scene_references,
+    'lights': light_references,
+    'objects': object_references,
+    'particles': particle_references,
+    'brushes': brush_references,
+    'meshes': mesh_references,
+    'curves': curve_references,
+    'speakers': speaker_references,
+    'lattices': lattice_references,
+    'metaballs': material_user_references,
+    'grease_pencils': material_user_references,
+    'linestyles': linestyle_references,
+
+    # data-blocks that only reference the actions that animate them
+    'armatures': animation_references,
+    'cameras': animation_references,
+    'lightprobes': animation_references,
+    'cache_files': animation_references,
+    'masks': animation_references,
+    'movieclips': animation_references,
+}
+
+# the names of the bpy.types of the data-blocks in each category that the
+# index identifies by name
+category_types = {
+    'actions': 'Action',
+    'armatures': 'Armature',
+    'brushes': 'Brush',
+    'cache_files': 'CacheFile',
+    'cameras': 'Camera',
+    'collections': 'Collection',
+    'curves': 'Curve',
+    'fonts': 'VectorFont',
+    'grease_pencils': 'GreasePencil',
+    'images': 'Image',
+    'lattices': 'Lattice',
+    'lightprobes': 'LightProbe',
+    'lights': 'Light',
+    'linestyles': 'FreestyleLineStyle',
+    'masks': 'Mask',
+    'materials': 'Material',
+    'meshes': 'Mesh',
+    'metaballs': 'MetaBall',
+    'movieclips': 'MovieClip',
+    'node_groups': 'NodeTree',
+    'objects': 'Object',
+    'particles': 'ParticleSettings',
+    'scenes': 'Scene',
+    'sounds': 'Sound',
+    'speakers': 'Speaker',
+    'textures': 'Texture',
+    'worlds': 'World',
+}
+
+# the names of the bpy.types that identify the data-blocks of each owner
+# category when they are reported by the depsgraph
+owner_types = {
+    category: category_types[category] for category in owner_categories
+}
+
+
+# the owner categories that nest owners of their own category. anything
+# that uses one of these owners also uses everything nested inside of it
+nesting_categories = ['collections', 'node_groups']
+
+# the owner categories whose data-blocks can have a node tree embedded in
+# them, which the depsgraph reports as a node tree of its own
+embedding_categories = [
+    'lights',
+    'linestyles',
+    'materials',
+    'scenes',
+    'textures',
+    'worlds',
+]
+
+# the object types that collections sort their objects into, every other
+# type of object is sorted into 'OTHER'
+collection_object_types = ['CAMERA', 'LIGHT', 'MESH']
+
+
+def collect_references(category, datablock):
+    # returns a set of the data-blocks referenced directly by an owner
+    references = set()
+    owner_categories[category](datablock, references)
+    return references
+
+
+def type_category(datablock, types):
+    # returns the category whose bpy.types name in the types table the
+    # data-block is an instance of, or None if it is of none of them
+
+    for category, type_name in types.items():
+        if isinstance(datablock, getattr(bpy.types, type_name)):
+            return category
+
+    return None
+
+
+def owner_category(datablock):
+    # returns the owner category of the data-block or None if data-blocks
+    # of its type do not reference other data-blocks
+    return type_category(datablock, owner_types)
+
+
+def is_node_group(node_tree):
+    # returns true if the node tree is a node group in bpy.data rather
+    # than a node tree embedded in another data-block
+
+    node_group = bpy.data.node_groups.get(node_tree.name)
+    return node_group is not None and \
+        node_group.as_pointer() == node_tree.as_pointer()
+
+
+def collect_embedded():
+    # returns a map of the pointer of every embedded node tree to the
+    # (category, key) tuple of the data-block that owns it
+
+    embedded = {}
+
+    for category in embedding_categories:
+        for datablock in getattr(bpy.data, category):
+            node_tree = getattr(datablock, 'node_tree', None)
+
+            if node_tree is not None:
+                embedded[node_tree.as_pointer()] = (category, datablock.name)
+
+    return embedded
+
+
+def strongly_connected_components(nodes, successors):
+    # returns a list of the strongly connected components of a graph in
+    # reverse topological order, so every component comes after the
+    # components it points to
+    # NOTE: this is an iterative version of Tarjan's algorithm so deep
+    # graphs cannot exceed Python's recursion limit
+
+    order = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    for root in nodes:
+        if root in order:
+            continue
+
+        order[root] = lowlink[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+
+        while work:
+            node, children = work[-1]
+
+            for child in children:
+
+                # descend into nodes that have not been visited yet
+                if child not in order:
+                    order[child] = lowlink[child] = len(order)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                    break
+
+                # a node still on the stack closes a cycle
+                elif child in on_stack:
+                    lowlink[node] = min(lowlink[node], order[child])
+
+            # every child of the node has been visited
+            else:
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                # the node is the root of a component
+                if lowlink[node] == order[node]:
+                    component = []
+
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+
+                        if member == node:
+                            break
+
+                    components.append(component)
+
+    return components
+
+
+# Atomic Data Manager Reference Index
+class ReferenceIndex:
+    # a reverse-reference index of every data-block in the project that
+    # maps each data-block to the data-blocks that use it
+
+    def __init__(self, backend=None, build=True):
+
+        # the data-blocks that each owner references directly
+        self.references = {}
+
+        # the number of data-blocks in each owner category when the owners
+        # were last walked
+        self.counts = {}
+
+        # the type of each object
+        self.object_types = {}
+
+        # the data-blocks that each collection and node group contains,
+        # either directly or through the owners nested inside of it
+        self.contents = {}
+
+        # the contents of collections that have been sorted into buckets
+        self.collection_buckets = {}
+
+        # the users of each data-block, grouped by category, including
+        # users that only use the data-block through a nesting owner
+        self.users = {}
+
+        # the owner of each embedded node tree by the node tree's pointer
+        self.embedded = {}
+
+        # the data-blocks used by a user that the user map reports but the
+        # index cannot identify, which are kept as if a root used them
+        self.held = set()
+
+        # the backend the references were collected with, either 'ATOMIC'
+        # or 'NATIVE'
+        self.backend = backend if backend else config.user_graph_backend
+
+        # an index that is not built right away is built with build_steps()
+        if build:
+            for progress in self.build_steps():
+                pass
+
+    def build_steps(self):
+        # walks every owner in the project once and links the results,
+        # yielding the fraction of the work that is done after each owner
+
+        # the user map is computed for the whole project in one step
+        if self.backend == 'NATIVE':
+            self.build_native()
+            yield 1.0
+            return
+
+        self.references = {}
+        self.counts = {}
+        self.object_types = {}
+        self.held = set()
+
+        total = sum(len(getattr(bpy.data, category))
+                    for category in owner_categories)
+        walked = 0
+
+        for category in owner_categories:
+            data = getattr(bpy.data, category)
+
+            for datablock in data:
+                self.walk(category, datablock)
+                walked += 1
+                yield walked / (total + 1)
+
+            self.counts[category] = len(data)
+
+        self.link()
+        yield 1.0
+
+    def build_native(self):
+        # collects the references from bpy.data.user_map() and links the
+        # results, only walking scenes for their compositors
+
+        self.references = {}
+        self.counts = {}
+        self.object_types = {}
+        self.held = set()
+        self.embedded = collect_embedded()
+
+        # the keys in each category, which tell data-blocks in bpy.data
+        # apart from data embedded in other data-blocks
+        keys = {}
+
+        # the category of each python type in the user map. ID.id_type
+        # only exists in newer versions of Blender, so data-blocks are
+        # identified by their bpy.types class like owner_category() does
+        type_categories = {}
+
+        def identify(datablock):
+            # returns the (category, key) tuple of a data-block in
+            # bpy.data or None if it is embedded data or of a type that
+            # the index does not identify
+
+            datablock_type = type(datablock)
+
+            if datablock_type not in type_categories:
+                type_categories[datablock_type] = \
+                    type_category(datablock, category_types)
+
+            category = type_categories[datablock_type]
+
+            if category is None:
+                return None
+
+            if category not in keys:
+                keys[category] = set(getattr(bpy.data, category).keys())
+
+            if datablock.name not in keys[category]:
+                return None
+
+            return category, datablock.name
+
+        def identify_user(user):
+            # returns the (category, key) tuple of the data-block in
+            # bpy.data that a user stands for, which is the data-block
+            # that owns an embedded node tree and the data-block that a
+            # shape key belongs to, or None if it cannot be identified
+
+            owner = identify(user)
+
+            if owner is not None:
+                return owner
+
+            if isinstance(user, bpy.types.NodeTree):
+                return self.embedded.get(user.as_pointer())
+
+            if isinstance(user, bpy.types.Key) and user.user is not None:
+                return identify_user(user.user)
+
+            return None
+
+        for datablock, datablock_users in bpy.data.user_map().items():
+            reference = identify(datablock)
+
+            if reference is None:
+                continue
+
+            for user in datablock_users:
+                owner = identify_user(user)
+
+                # a user that cannot be identified may be live, so what it
+                # uses is kept rather than reported as unused
+                if owner is None:
+                    self.held.add(reference)
+
+                elif owner != reference:
+                    self.references.setdefault(owner, set()).add(reference)
+
+        # the compositor usage that the user map does not attribute to
+        # the scene's images and node groups
+        for scene in bpy.data.scenes:
+            self.references.setdefault(('scenes', scene.name), set()) \
+                .update(collect_references('scenes', scene))
+
+        for obj in bpy.data.objects:
+            self.object_types[obj.name] = obj.type
+
+        self.link()
+
+    def walk(self, category, datablock):
+        # stores the references of a single owner
+
+        key = datablock.name
+        self.references[(category, key)] = \
+            collect_references(category, datablock)
+
+        if category == 'objects':
+            self.object_types[key] = datablock.type
+
+    def link(self):
+        # derives the contents of nesting owners and the user map from the
+        # direct references of each owner
+
+        self.contents = self.collect_contents()
+        self.collection_buckets = {}
+        self.users = {}
+
+        for owner in self.references:
+            self.link_owner(owner)
+
+    def link_owner(self, owner):
+        # records the owner as a user of everything it references
+
+        for reference in self.references[owner]:
+            self.add_user(reference, owner)
+
+            # the owner also uses everything nested inside the reference
+            for content in self.contents.get(reference, ()):
+                if content != owner:
+                    self.add_user(content, owner)
+
+    def unlink_owner(self, owner):
+        # removes the owner from the users of everything it references
+
+        category, key = owner
+
+        for reference in self.references.get(owner, ()):
+            contents = self.contents.get(reference, set())
+
+            for datablock in contents | {reference}:
+                self.users.get(datablock, {}).get(category, set()) \
+                    .discard(key)
+
+    def update(self, category, datablock):
+        # re-walks a single owner, patches its entries in the user map and
+        # returns true if its references changed
+
+        owner = (category, datablock.name)
+        references = collect_references(category, datablock)
+
+        # nothing to patch if the owner's references did not change
+        if references == self.references.get(owner):
+            return False
+
+        # a change to a nesting owner can alter the contents of every
+        # owner that nests it, so the whole user map is relinked
+        if category in nesting_categories:
+            self.references[owner] = references
+            self.link()
+
+        # any other owner only affects its own entries
+        else:
+            self.unlink_owner(owner)
+            self.references[owner] = references
+            self.link_owner(owner)
+
+        return True
+
+    def resync(self, category):
+        # re-walks the owners of a category that data-blocks were added
+        # to or removed from
+
+        data = getattr(bpy.data, category)
+        keys = set(data.keys())
+
+        # forget owners that no longer exist
+        for owner in list(self.references):
+            if owner[0] == category and owner[1] not in keys:
+                del self.references[owner]
+
+        # walk owners that are new to the index
+        for datablock in data:
+            if (category, datablock.name) not in self.references:
+                self.walk(category, datablock)
+
+        self.counts[category] = len(data)
+        self.link()
+
+    def patch(self, updates):
+        # patches the index with the data-blocks that the depsgraph
+        # reported as updated and returns true if any references changed,
+        # or None if the updates could not be applied incrementally
+
+        # the user map can only be computed for the whole project
+        if self.backend == 'NATIVE':
+            return None
+
+        changed = False
+
+        # data-blocks were added or removed since the last patch
+        for category in owner_categories:
+            if len(getattr(bpy.data, category)) != self.counts[category]:
+                self.resync(category)
+                changed = True
+
+        for update in updates:
+
+            # moving, posing or animating an object does not change what
+            # it references. retargeting a constraint is only reported as
+            # a transform, so subscribe() catches that instead
+            if update.is_updated_transform and not \
+                    (update.is_updated_geometry or
+                     update.is_updated_shading):
+                continue
+
+            datablock = update.id.original
+            category = owner_category(datablock)
+
+            # skip data-blocks that do not reference anything
+            if category is None:
+                continue
+
+            # a node tree embedded in another data-block is patched
+            # through the data-block that owns it
+            if category == 'node_groups' and not is_node_group(datablock):
+                owner = self.embedded_owner(datablock)
+
+                if owner is None:
+                    return None
+
+                category, datablock = owner
+
+            # an owner the index has never seen cannot be patched
+            if (category, datablock.name) not in self.references:
+                return None
+
+            if self.update(category, datablock):
+                changed = True
+
+        return changed
+
+    def embedded_owner(self, node_tree):
+        # returns the category and data-block that the node tree is
+        # embedded in or None if it is not embedded in an owner
+
+        pointer = node_tree.as_pointer()
+        owner = self.find_embedded(pointer)
+
+        # the owner may be new or may have been given a new node tree
+        if owner is None:
+            self.embedded = collect_embedded()
+            owner = self.find_embedded(pointer)
+
+        return owner
+
+    def find_embedded(self, pointer):
+        # returns the category and data-block that the node tree with the
+        # pointer was embedded in when the owners were last collected, or
+        # None if that owner no longer holds it
+
+        if pointer not in self.embedded:
+            return None
+
+        category, key = self.embedded[pointer]
+        datablock = getattr(bpy.data, category).get(key)
+
+        if datablock is None or datablock.node_tree is None or \
+                datablock.node_tree.as_pointer() != pointer:
+            return None
+
+        return category, datablock
+
+    def collect_contents(self):
+        # returns a map of every collection and node group to the set of
+        # data-blocks it contains, either directly or through the owners
+        # nested inside of it
+
+        contents = {}
+
+        def nested(owner):
+            # returns the owners nested directly inside of the owner
+            return [reference for reference in
+                    self.references.get(owner, ())
+                    if reference[0] == owner[0]]
+
+        owners = [owner for owner in self.references
+                  if owner[0] in nesting_categories]
+
+        # components arrive with nested owners before the owners that
+        # nest them, so the contents of every nested owner are already
+        # known. owners that nest each other form one component and share
+        # their contents, which keeps recursive node groups from looping
+        for component in strongly_connected_components(owners, nested):
+            component_contents = set()
+
+            for owner in component:
+                for reference in self.references.get(owner, ()):
+                    component_contents.add(reference)
+
+                    if reference in contents:
+                        component_contents |= contents[reference]
+
+            for owner in component:
+                contents[owner] = component_contents
+
+        return contents
+
+    def add_user(self, datablock, owner):
+        # records the owner as a user of the data-block
+
+        category, key = owner
+        self.users.setdefault(datablock, {}) \
+            .setdefault(category, set()).add(key)
+
+    def lookup(self, category, key, user_category):
+        # returns a list of keys of data-blocks in the user category that
+        # use the specified data-block
+        return list(
+            self.users.get((category, key), {}).get(user_category, ()))
+
+    def contains(self, node_group_key, category, key):
+        # returns true if the node group contains the data-block directly
+        # or through one of its nested node groups
+        return (category, key) in self.contents.get(
+            ('node_groups', node_group_key), ())
+
+    def reachable(self, roots):
+        # returns a set of every data-block that can be reached from the
+        # roots by following references, marking each data-block once
+
+        marked = set(roots)
+        stack = list(marked)
+
+        while stack:
+            for reference in self.references.get(stack.pop(), ()):
+                if reference not in marked:
+                    marked.add(reference)
+                    stack.append(reference)
+
+        return marked
+
+    def collection_bucket(self, collection_key, bucket):
+        # returns a list of keys from one of the collection's buckets,
+        # which are either 'CHILDREN' for its child collections or an
+        # object type for the objects in it and its child collections
+
+        collection = ('collections', collection_key)
+
+        # sort the collection's contents into buckets the first time they
+        # are needed
+        if collection not in self.collection_buckets:
+            buckets = {'CHILDREN': set(), 'OTHER': set()}
+
+            for object_type in collection_object_types:
+                buckets[object_type] = set()
+
+            for category, key in self.contents.get(collection, ()):
+                if category == 'collections':
+                    buckets['CHILDREN'].add(key)
+                else:
+                    object_type = self.object_types.get(key)
+                    if object_type not in collection_object_types:
+                        object_type = 'OTHER'
+                    buckets[object_type].add(key)
+
+            buckets['CHILDREN'].discard(collection_key)
+            self.collection_buckets[collection] = buckets
+
+        return list(self.collection_buckets[collection][bucket])
+
+
+def compare(first, second):
+    # returns a list of differences between the users found by two
+    # reference indexes, limited to the categories of data-blocks that
+    # both of them have users for and to users in the owner categories
+    # that the Atomic walker covers. each difference is a tuple of the
+    # data-block, the user category, the keys only the first index found,
+    # and the keys only the second index found
+
+    differences = []
+
+    covered = {datablock[0] for datablock in first.users} & \
+        {datablock[0] for datablock in second.users}
+
+    for datablock in set(first.users) | set(second.users):
+        if datablock[0] not in covered:
+            continue
+
+        first_users = first.users.get(datablock, {})
+        second_users = second.users.get(datablock, {})
+
+        for category in owner_categories:
+            only_first = first_users.get(category, set()) - \
+                second_users.get(category, set())
+            only_second = second_users.get(category, set()) - \
+                first_users.get(category, set())
+
+            if only_first or only_second:
+                differences.append(
+                    (datablock, category,
+                     sorted(only_first), sorted(only_second))
+                )
+
+    return sorted(differences)
+
+
+# the project's reference index, which is built the first time it is
+# needed, patched as the project changes, and thrown away whenever it
+# cannot be patched
+reference_index = None
+
+# a counter that is incremented whenever the project's data may have
+# changed, so results computed from the data can tell when they are stale
+generation = 0
+
+# the owner of Atomic's message bus subscriptions
+msgbus_owner = object()
+
+# the bpy.types whose renames invalidate the reference index, which are
+# the types of every data-block that the index identifies by name
+renamed_types = sorted(set(category_types.values()))
+
+
+def get():
+    # returns the reference index, building it if it has been invalidated
+
+    global reference_index
+
+    if reference_index is None:
+        reference_index = ReferenceIndex()
+
+    return reference_index
+
+
+def build_steps():
+    # builds the reference index in steps, yielding the fraction of the
+    # work that is done after each one. the build starts over if the data
+    # changes between steps, since the owners walked so far may be stale
+
+    global reference_index
+
+    while reference_index is None:
+        start = generation
+        building = ReferenceIndex(build=False)
+
+        for progress in building.build_steps():
+            yield progress
+
+            if generation != start:
+                break
+
+        # another caller may have built the index in the meantime
+        if generation == start and reference_index is None:
+            reference_index = building
+
+
+def lazy_references():
+    # returns a function that returns the set of data-blocks an owner
+    # references directly, read from the reference index if it is built
+    # and walked the first time the owner is reached otherwise
+
+    # the index is held on to in case it is invalidated while the
+    # function is in use
+    built = reference_index
+
+    if built is not None:
+        return lambda owner: built.references.get(owner, ())
+
+    # the owners of each category by key, gathered the first time an
+    # owner of the category is reached, and the data generation they
+    # were gathered in
+    owners = {}
+    owners_generation = generation
+    walked = {}
+
+    def references(owner):
+        nonlocal owners_generation
+
+        # owners gathered before the data changed may have been freed
+        if owners_generation != generation:
+            owners.clear()
+            owners_generation = generation
+
+        if owner not in walked:
+            category, key = owner
+            walked[owner] = set()
+
+            if category in owner_categories:
+                if category not in owners:
+                    owners[category] = {
+                        datablock.name: datablock
+                        for datablock in getattr(bpy.data, category)
+                    }
+
+                datablock = owners[category].get(key)
+
+                if datablock is not None:
+                    walked[owner] = collect_references(category, datablock)
+
+        return walked[owner]
+
+    return references
+
+
+def mark_steps(seeds, targets, references):
+    # marks the data-blocks that can be reached from the seeds, yielding
+    # the fraction of the targets marked after each owner is followed,
+    # and returns the set of marked data-blocks, or None if the data
+    # changed while the marking was paused. the marking stops early once
+    # every target is marked, so the marks are only complete if a target
+    # is left unmarked
+
+    start = generation
+    marked = set(seeds)
+    stack = list(marked)
+    remaining = set(targets) - marked
+
+    while stack and remaining:
+        for reference in references(stack.pop()):
+            if reference not in marked:
+                marked.add(reference)
+                stack.append(reference)
+                remaining.discard(reference)
+
+        yield 1.0 - len(remaining) / (len(targets) + 1)
+
+        # the marks so far may be stale if the data changed
+        if generation != start:
+            return None
+
+    return marked
+
+
+def invalidate(*args):
+    # discards the reference index so it is rebuilt on its next use
+
+    global reference_index
+    reference_index = None
+    bump()
+
+
+def bump():
+    # increments the data generation, which marks every result computed
+    # from an earlier generation as stale
+
+    global generation
+    generation += 1
+
+
+def constraint_pointers():
+    # returns a list of (type, identifier) tuples of the writable pointer
+    # properties of every type of constraint, such as their targets
+
+    pointers = []
+
+    for type_name in dir(bpy.types):
+        constraint_type = getattr(bpy.types, type_name)
+
+        if not isinstance(constraint_type, type) or \
+                constraint_type is bpy.types.Constraint or \
+                not issubclass(constraint_type, bpy.types.Constraint):
+            continue
+
+        for prop in constraint_type.bl_rna.properties:
+            if prop.type == 'POINTER' and not prop.is_readonly:
+                pointers.append((constraint_type, prop.identifier))
+
+    return pointers
+
+
+def subscribe():
+    # invalidates the reference index whenever a data-block is renamed or
+    # a constraint is retargeted, since the depsgraph reports neither as
+    # a change to the data's references
+
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+
+    for type_name in renamed_types:
+        bpy.msgbus.subscribe_rna(
+            key=(getattr(bpy.types, type_name), "name"),
+            owner=msgbus_owner,
+            args=(),
+            notify=invalidate
+        )
+
+    for constraint_type, identifier in constraint_pointers():
+        bpy.msgbus.subscribe_rna(
+            key=(constraint_type, identifier),
+            owner=msgbus_owner,
+            args=(),
+            notify=invalidate
+        )
+
+
+def changes_data(update):
+    # returns true if a depsgraph update may have changed the references
+    # that cached results are computed from when there is no index to
+    # patch. selecting or moving objects only updates scenes and objects
+    # without tagging their geometry or shading
+
+    if update.is_updated_geometry or update.is_updated_shading:
+        return True
+
+    return not isinstance(update.id.original,
+                          (bpy.types.Scene, bpy.types.Object))
+
+
+@persistent
+def depsgraph_update_handler(scene, depsgraph=None):
+    # patches the reference index with the depsgraph's updates and bumps
+    # the data generation if data-blocks were added or removed or their
+    # references changed. edits that only change the contents of data,
+    # such as sculpting or playing animation, leave the generation alone
+
+    # older versions of Blender do not pass the depsgraph to the handler
+    if depsgraph is None:
+        invalidate()
+        return
+
+    updates = list(depsgraph.updates)
+
+    # without an index to patch, any update that is not a selection or a
+    # move may have changed references. scans build the index, so this
+    # only lasts until the next scan
+    if reference_index is None:
+        changed = any(changes_data(update) for update in updates)
+
+    else:
+        changed = reference_index.patch(updates)
+
+        if changed is None:
+            invalidate()
+            return
+
+    if changed:
+        bump()
+
+
+@persistent
+def invalidate_handler(*args):
+    # invalidates the reference index after an undo or redo
+    invalidate()
+
+
+@persistent
+def load_handler(*args):
+    # invalidates the reference index when a new file is loaded and
+    # renews the message bus subscriptions, which do not survive a file
+    # load
+    invalidate()
+    subscribe()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_handler)
+    bpy.app.handlers.undo_post.append(invalidate_handler)
+    bpy.app.handlers.redo_post.append(invalidate_handler)
+    bpy.app.handlers.load_post.append(load_handler)
+
+    subscribe()
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_handler)
+    bpy.app.handlers.undo_post.remove(invalidate_handler)
+    bpy.app.handlers.redo_post.remove(invalidate_handler)
+    bpy.app.handlers.load_post.remove(load_handler)
+
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    invalidate()
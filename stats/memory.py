@@ -0,0 +1,226 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains functions that estimate how much memory data-blocks
+take up, so the data that frees the most memory can be cleaned first.
+
+The estimates are computed a category at a time. The element counts of
+each data-block, such as a mesh's vertices and loops, are read one
+data-block at a time, since Blender does not expose them for a whole
+collection, and reading an image's size would load its pixels. The rows
+of counts are then weighted by the bytes each element takes up with a
+single numpy product. Estimates are cached until the data generation
+changes.
+
+"""
+
+import bpy
+import numpy
+from atomic_data_manager.stats import index
+from atomic_data_manager.stats import unused
+
+
+# the bytes a data-block takes up regardless of its contents, which
+# covers its ID and the rest of its struct
+datablock_bytes = 1024
+
+
+def packed_size(datablock):
+    # returns the size in bytes of the data-block's packed file
+    packed_file = getattr(datablock, 'packed_file', None)
+    return packed_file.size if packed_file else 0
+
+
+def action_elements(action):
+    # returns the number of f-curves and keyframes in the action
+
+    keyframes = 0
+    for fcurve in action.fcurves:
+        keyframes += len(fcurve.keyframe_points)
+
+    return len(action.fcurves), keyframes
+
+
+def armature_elements(armature):
+    # returns the number of bones in the armature
+    return len(armature.bones),
+
+
+def curve_elements(curve):
+    # returns the number of bezier and nurbs points in the curve
+
+    bezier_points = 0
+    points = 0
+
+    for spline in curve.splines:
+        bezier_points += len(spline.bezier_points)
+        points += len(spline.points)
+
+    return bezier_points, points
+
+
+def image_elements(image):
+    # returns the size in bytes of the image's pixels and packed file
+
+    pixels = 0
+
+    # reading the size of an image that has not been loaded loads it,
+    # so only loaded images are counted
+    if image.has_data:
+        width, height = image.size
+        pixels = width * height * image.depth // 8
+
+    return pixels, packed_size(image)
+
+
+def mesh_elements(mesh):
+    # returns the number of vertices, edges, loops and polygons in the
+    # mesh and the number of loops in its uv and vertex color layers
+
+    loops = len(mesh.loops)
+
+    return (
+        len(mesh.vertices),
+        len(mesh.edges),
+        loops,
+        len(mesh.polygons),
+        loops * len(mesh.uv_layers),
+        loops * len(mesh.vertex_colors),
+    )
+
+
+def node_tree_elements(datablock):
+    # returns the number of nodes in the data-block's node tree
+
+    node_tree = datablock if hasattr(datablock, 'nodes') else \
+        getattr(datablock, 'node_tree', None)
+
+    return len(node_tree.nodes) if node_tree else 0,
+
+
+def particle_elements(particle):
+    # returns the number of particles the particle settings emit
+    return particle.count,
+
+
+def packed_elements(datablock):
+    # returns the size in bytes of the data-block's packed file
+    return packed_size(datablock),
+
+
+# the functions that count the elements of each category's data-blocks
+# and the bytes each of those elements takes up. data-blocks of other
+# categories are estimated at datablock_bytes
+category_elements = {
+    'actions': (action_elements, [256, 64]),
+    'armatures': (armature_elements, [512]),
+    'curves': (curve_elements, [64, 48]),
+    'fonts': (packed_elements, [1]),
+    'images': (image_elements, [1, 1]),
+    'lights': (node_tree_elements, [1024]),
+    'materials': (node_tree_elements, [1024]),
+    'meshes': (mesh_elements, [20, 12, 8, 12, 12, 4]),
+    'node_groups': (node_tree_elements, [1024]),
+    'particles': (particle_elements, [88]),
+    'sounds': (packed_elements, [1]),
+    'textures': (node_tree_elements, [1024]),
+    'worlds': (node_tree_elements, [1024]),
+}
+
+# the estimates of each category that has been estimated, keyed by the
+# keys of its data-blocks
+size_cache = {}
+
+# the data generation that the cached estimates were computed in
+size_cache_generation = None
+
+
+def sizes(category):
+    # returns a dictionary that maps the key of every data-block in the
+    # category to its estimated size in bytes
+
+    global size_cache_generation
+
+    # discard estimates computed from an older generation of the data
+    if size_cache_generation != index.generation:
+        size_cache.clear()
+        size_cache_generation = index.generation
+
+    if category in size_cache:
+        return size_cache[category]
+
+    data = getattr(bpy.data, category)
+    keys = data.keys()
+    estimates = numpy.full(len(keys), datablock_bytes, dtype=numpy.int64)
+
+    if category in category_elements and keys:
+        count, weights = category_elements[category]
+
+        # a row of element counts for each data-block
+        counts = numpy.array(
+            [count(datablock) for datablock in data],
+            dtype=numpy.int64
+        )
+
+        estimates += counts @ numpy.array(weights, dtype=numpy.int64)
+
+    size_cache[category] = dict(zip(keys, estimates.tolist()))
+    return size_cache[category]
+
+
+def size(category, key):
+    # returns the estimated size in bytes of a single data-block
+    return sizes(category).get(key, 0)
+
+
+def total(category, keys=None):
+    # returns the estimated size in bytes of every data-block in the
+    # category or of the data-blocks with the specified keys
+
+    category_sizes = sizes(category)
+
+    if keys is None:
+        return sum(category_sizes.values())
+
+    return sum(category_sizes.get(key, 0) for key in keys)
+
+
+def largest_first(category, keys):
+    # returns a list of the keys sorted by the estimated size of their
+    # data-blocks, from the largest to the smallest
+
+    category_sizes = sizes(category)
+    return sorted(keys, key=lambda key: category_sizes.get(key, 0),
+                  reverse=True)
+
+
+def reclaimable(categories):
+    # returns a list of (category, reclaimable bytes, total bytes) tuples
+    # sorted from the category whose unused data-blocks would free the
+    # most memory to the one that would free the least. unused data-blocks
+    # are found with the shallow user count check
+
+    estimates = []
+
+    for category in categories:
+        keys = unused.shallow(getattr(bpy.data, category))
+        estimates.append((category, total(category, keys), total(category)))
+
+    return sorted(estimates, key=lambda estimate: estimate[1], reverse=True)
@@ -24,6 +24,13 @@ This file contains miscellaneous statistics functions.
 
 import bpy
 import os
+from atomic_data_manager.stats import blendfile
+
+
+# the per-category sizes of the saved Blender file and the (path,
+# modification time, size) of the file they were read from
+category_size_cache = None
+category_size_cache_key = None
 
 
 def blend_size():
@@ -32,6 +39,54 @@ def blend_size():
     filepath = bpy.data.filepath
     size_bytes = os.stat(filepath).st_size if filepath != '' else -1
 
+    return format_size(size_bytes)
+
+
+def blend_category_sizes():
+    # returns a list of (category, bytes) tuples of how much of the saved
+    # Blender file each category takes up, from the largest category to
+    # the smallest. the file is only read again after it is saved
+
+    global category_size_cache
+    global category_size_cache_key
+
+    filepath = bpy.data.filepath
+
+    if filepath == '' or not os.path.isfile(filepath):
+        return []
+
+    file_stat = os.stat(filepath)
+    key = (filepath, file_stat.st_mtime, file_stat.st_size)
+
+    if key == category_size_cache_key:
+        return category_size_cache
+
+    try:
+        blend_file = blendfile.BlendFile(filepath)
+    except (blendfile.BlendFileError, OSError):
+        return []
+
+    sizes = blend_file.category_sizes()
+
+    # the sizes of a compressed file are read from its uncompressed
+    # contents, so they are scaled down to their share of the file
+    uncompressed_size = sum(sizes.values())
+    if blend_file.compressed and uncompressed_size:
+        scale = file_stat.st_size / uncompressed_size
+        sizes = {category: int(size * scale)
+                 for category, size in sizes.items()}
+
+    category_size_cache = sorted(sizes.items(), key=lambda item: item[1],
+                                 reverse=True)
+    category_size_cache_key = key
+
+    return category_size_cache
+
+
+def format_size(size_bytes):
+    # returns a number of bytes as a string scaled to the largest unit
+    # that it is at least one of
+
     kilobyte = 1024  # bytes
     megabyte = 1048576  # bytes
     gigabyte = 1073741824  # bytes
@@ -21,43 +21,363 @@ with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
 This file contains functions that detect missing files in the Blender
 project.
 
+The paths of the data-blocks are resolved on the main thread, since bpy
+is not thread-safe, and then grouped by their directories. Each directory
+is listed once in a thread pool, so slow network shares are read in
+parallel and a directory of a thousand textures costs one listing rather
+than a thousand file checks. Listings are cached for a few seconds and
+after that are only listed again if the directory has been modified.
+
+The checks can also run in a background thread, which is how missing
+files are detected when a file is loaded, so the thread pool and the
+directory cache are guarded by locks.
+
+The pool's worker threads are not daemon threads, so Python joins them
+when Blender exits. A listing that is stuck on an unresponsive share
+delays Blender's exit until the operating system gives up on the share,
+even though Atomic stops waiting for it after the timeout in Atomic's
+preferences.
+
 """
 
 import bpy
+import concurrent.futures
 import os
+import threading
+import time
+from atomic_data_manager import config
+from atomic_data_manager.stats import exclusions
 
 
-def get_missing(data):
-    # returns a list of keys of unpacked data-blocks with non-existent
-    # filepaths
+# the seconds a directory listing is trusted before the directory's
+# modification time is checked again
+directory_cache_ttl = 5.0
+
+# the listings of recently checked directories, keyed by their paths. each
+# listing is a (modification time, time listed, file names) tuple
+directory_cache = {}
+
+# guards the directory cache, which is read and written by the main thread
+# and the background detection
+directory_cache_lock = threading.Lock()
+
+# the thread pool that checks whether files exist or None if it has not
+# been created yet, and the number of workers it was created with
+executor = None
+executor_workers = None
+
+# guards the thread pool, which the main thread may replace or shut down
+# while the background detection is using it
+executor_lock = threading.Lock()
+
+
+def get_executor():
+    # returns the thread pool, creating it again if the number of workers
+    # in Atomic's preferences has changed
+
+    global executor
+    global executor_workers
+
+    with executor_lock:
+        workers = config.missing_file_workers
+
+        if executor is None or executor_workers != workers:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="atomic_missing"
+            )
+            executor_workers = workers
+
+        return executor
+
+
+def shutdown():
+    # shuts down the thread pool without waiting for checks that are stuck
+    # on an unresponsive share. their threads still finish on their own and
+    # are joined when Blender exits
+
+    global executor
+
+    with executor_lock:
+        if executor is not None:
+            executor.shutdown(wait=False)
+            executor = None
+
+
+def list_directory(directory, listing=None):
+    # returns a (modification time, time listed, file names, subdirectory
+    # names) listing of the directory, reusing the previous listing if the
+    # directory has not been modified since, or None if the directory
+    # cannot be read. file names are normalized for comparison, so they
+    # are lowercase on case-insensitive platforms
+
+    try:
+        modified = os.stat(directory).st_mtime
+    except (FileNotFoundError, NotADirectoryError):
+        return 0, time.monotonic(), frozenset(), frozenset()
+    except OSError:
+        return None
+
+    if listing is not None and listing[0] == modified:
+        return modified, time.monotonic(), listing[2], listing[3]
+
+    files = []
+    subdirectories = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.name)
+                elif entry.is_file():
+                    files.append(os.path.normcase(entry.name))
+    except OSError:
+        return None
+
+    return (modified, time.monotonic(), frozenset(files),
+            frozenset(subdirectories))
+
+
+def check_files(paths):
+    # returns a list of whether each path is an existing file, in the order
+    # of the paths, or None for each path whose check did not finish in
+    # time. every directory is given the timeout in Atomic's preferences
+
+    if not paths:
+        return []
+
+    pool = get_executor()
+    now = time.monotonic()
+
+    # the paths grouped by their directories
+    directories = {}
+    for path in paths:
+        directories.setdefault(os.path.dirname(path), set()).add(path)
+
+    with directory_cache_lock:
+        listings = {directory: directory_cache.get(directory)
+                    for directory in directories}
+
+    # list the directories whose listings are missing or too old
+    futures = {}
+    for directory, listing in listings.items():
+        if listing is None or now - listing[1] > directory_cache_ttl:
+
+            # the pool may be shut down while a background check is using
+            # it, such as when the add-on is disabled, in which case the
+            # directory is left unchecked
+            try:
+                futures[directory] = pool.submit(
+                    list_directory, directory, listing)
+            except RuntimeError:
+                futures[directory] = None
+
+    # the workers list the directories in rounds, each of which may take
+    # up to the timeout
+    submitted = [future for future in futures.values()
+                 if future is not None]
+
+    if submitted:
+        rounds = -(-len(submitted) // config.missing_file_workers)
+        concurrent.futures.wait(
+            submitted, timeout=config.missing_file_timeout * rounds)
+
+    exists = {}
+    for directory, directory_paths in directories.items():
+        listing = listings[directory]
+        unchecked = False
+
+        if directory in futures:
+            future = futures[directory]
+            unchecked = future is None or not future.done()
+
+            with directory_cache_lock:
+                if not unchecked and future.result() is not None:
+                    listing = future.result()
+                    directory_cache[directory] = listing
+                else:
+                    if future is not None:
+                        future.cancel()
+                    listing = None
+                    directory_cache.pop(directory, None)
+
+        for path in directory_paths:
+
+            # directories that could not be read in time are unknown
+            if unchecked:
+                exists[path] = None
+
+            # directories that could not be listed are checked file by file
+            elif listing is None:
+                exists[path] = os.path.isfile(path)
+
+            else:
+                exists[path] = \
+                    os.path.normcase(os.path.basename(path)) in listing[2]
+
+    return [exists[path] for path in paths]
+
+
+def clear_cache():
+    # discards every directory listing so directories are listed again
+
+    with directory_cache_lock:
+        directory_cache.clear()
+
+
+def resolve(data):
+    # returns a (keys, unpacked keys and paths, order) tuple of the data
+    # that can be checked for missing files away from the main thread:
+    # the keys of packed data-blocks without a filepath, which are always
+    # missing, a list of (key, absolute path) tuples of the unpacked
+    # data-blocks and the position of each data-block in the data
 
     missing = []
 
-    # list of keys that should not be flagged
-    do_not_flag = ["Render Result", "Viewer Node", "D-NOISE Export"]
+    # data-blocks that should not be flagged
+    excluded = exclusions.missing_rules()
+
+    # the keys and absolute paths of the unpacked data-blocks, which are
+    # checked together
+    unpacked = []
 
     for datablock in data:
 
+        # skip data-blocks that are excluded by the exclusion rules
+        if excluded(datablock):
+            continue
+
         # the absolute path to our data-block
         abspath = bpy.path.abspath(datablock.filepath)
 
-        # if data-block is not packed and has an invalid filepath
-        if not datablock.packed_files and not os.path.isfile(abspath):
-
-            # if data-block is not in our do not flag list
-            # append it to the missing data list
-            if datablock.name not in do_not_flag:
-                missing.append(datablock.name)
+        # if data-block is not packed its file must exist
+        if not datablock.packed_files:
+            unpacked.append((datablock.name, abspath))
 
         # if data-block is packed but it does not have a filepath
-        elif datablock.packed_files and not abspath:
+        # append it to the missing data list
+        elif not abspath:
+            missing.append(datablock.name)
+
+    order = {datablock.name: position
+             for position, datablock in enumerate(data)}
+
+    return missing, unpacked, order
+
+
+def check_resolved(resolved):
+    # returns a list of keys of the data-blocks in the output of resolve()
+    # with non-existent filepaths, which does not use bpy so it can run in
+    # a background thread
+
+    missing, unpacked, order = resolved
+    missing = list(missing)
+
+    exists = check_files([abspath for _, abspath in unpacked])
+
+    for (key, abspath), found in zip(unpacked, exists):
+        if found is False:
+            missing.append(key)
+
+    # keep the order of the data-blocks in the data
+    return sorted(missing, key=order.get)
+
+
+def get_missing(data):
+    # returns a list of keys of unpacked data-blocks with non-existent
+    # filepaths. data-blocks whose files could not be checked in time are
+    # not flagged
+    return check_resolved(resolve(data))
+
+
+# Atomic Data Manager Missing File Detection
+class Detection:
+    # a check for missing images and libraries that runs in a background
+    # thread once the paths have been resolved on the main thread
+
+    def __init__(self):
+
+        # the keys of the missing images and libraries, which are set when
+        # the detection finishes
+        self.images = None
+        self.libraries = None
+
+        self.thread = threading.Thread(
+            target=self.run,
+            args=(resolve(bpy.data.images), resolve(bpy.data.libraries)),
+            daemon=True
+        )
+        self.thread.start()
+
+    def run(self, images, libraries):
+        self.images = check_resolved(images)
+        self.libraries = check_resolved(libraries)
+
+    def done(self):
+        # returns true if the detection has finished
+        return not self.thread.is_alive()
+
+
+# the detection that is running in the background or None if there is no
+# detection
+detection = None
+
+# the (images, libraries) keys of the last detection that finished, which
+# have not been shown to the user yet, or None if there are none
+detected = None
+
+
+def start_detection():
+    # starts detecting missing files in the background, replacing any
+    # detection that is already running
+
+    global detection
+    global detected
+
+    detection = Detection()
+    detected = None
+
+
+def poll_detection():
+    # returns true once the background detection has finished, at which
+    # point its results are stored in detected
+
+    global detection
+    global detected
+
+    if detection is None or not detection.done():
+        return False
+
+    detected = (detection.images, detection.libraries)
+    detection = None
+
+    return True
+
+
+def cancel_detection():
+    # discards the background detection and its results. a thread that is
+    # still checking files finishes on its own
+
+    global detection
+    global detected
+
+    detection = None
+    detected = None
+
+
+def take_detected():
+    # returns the (images, libraries) keys of the last detection and
+    # forgets them so they are only used once, or None if there are none
+
+    global detected
 
-            # if data-block is not in our do not flag list
-            # append it to the missing data list
-            if datablock.name not in do_not_flag:
-                missing.append(datablock.name)
+    results = detected
+    detected = None
 
-    return missing
+    return results
 
 
 def images():
@@ -0,0 +1,95 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains the predicates that decide whether a data-block is
+unused or excluded, shared by the add-on and by stats/blendfile.py.
+
+They only read the attributes that bpy.data's data-blocks and the blend
+file reader's BlendID have in common, and this file does not import bpy
+or the rest of the add-on, so the blend file reader can use it outside
+of Blender.
+
+"""
+
+import re
+
+
+# the keys of data-blocks that Blender generates and that should never be
+# flagged as unused or missing
+builtin_names = frozenset([
+    "Render Result",
+    "Viewer Node",
+    "D-NOISE Export",
+])
+
+# the custom property that tags a data-block as excluded
+exclude_tag = "atomic_exclude"
+
+# the compiled predicates, keyed by their rules
+compiled = {}
+
+
+def compile_rules(names=(), prefixes=(), linked=False, fake_users=False,
+                  tagged=False):
+    # returns a predicate that returns true if a data-block is excluded by
+    # any of the rules, reusing the predicate if the rules were compiled
+    # before
+
+    key = (frozenset(names), tuple(prefixes), linked, fake_users, tagged)
+
+    if key in compiled:
+        return compiled[key]
+
+    names = frozenset(names)
+
+    # every prefix is matched by a single regular expression
+    match = None
+    if prefixes:
+        match = re.compile(
+            "|".join(re.escape(prefix) for prefix in prefixes)).match
+
+    def excluded(datablock):
+        name = datablock.name
+
+        return (
+            name in names or
+            (match is not None and match(name) is not None) or
+            (linked and datablock.library is not None) or
+            (fake_users and datablock.use_fake_user) or
+            (tagged and exclude_tag in datablock) or
+            (tagged and getattr(datablock, 'asset_data', None) is not None)
+        )
+
+    compiled[key] = excluded
+    return excluded
+
+
+def is_unused(datablock):
+    # returns true if the data-block has no users or only a fake user
+    return datablock.users == 0 or \
+        (datablock.users == 1 and datablock.use_fake_user)
+
+
+def shallow(datablocks, excluded):
+    # returns a list of names of the data-blocks that are unused by their
+    # user counts and not excluded by the predicate
+
+    return [datablock.name for datablock in datablocks
+            if is_unused(datablock) and not excluded(datablock)]
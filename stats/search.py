@@ -0,0 +1,311 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains the index that the missing file search looks files up
+in.
+
+The index maps the name of every file under the search roots in Atomic's
+preferences to the paths of the files with that name, so relinking any
+number of missing files is one dictionary lookup each. The directories
+are walked in parallel with os.scandir() and the index is saved to a
+cache file in Blender's config directory. When it is refreshed, only the
+directories that have been modified since they were last listed are
+listed again.
+
+When several files share the name of a missing file, the files in the
+directories most like the missing file's directory are preferred. If
+files with different contents are still left, the file cannot be chosen
+automatically.
+
+"""
+
+import bpy
+import concurrent.futures
+import hashlib
+import json
+import os
+from atomic_data_manager import config
+from atomic_data_manager.stats import missing
+
+
+# the version of the cache file's format
+cache_version = 2
+
+# the bytes read at a time when hashing a file
+hash_chunk_bytes = 1 << 20
+
+
+# Atomic Data Manager File Index
+class FileIndex:
+    # the files under the search roots, keyed by their names
+
+    def __init__(self):
+
+        # the listing of every directory under the search roots, keyed by
+        # its path. each listing is a (modification time, time listed,
+        # file names, subdirectory names) tuple from
+        # missing.list_directory()
+        self.directories = {}
+
+        # the search roots the directories were listed from
+        self.roots = []
+
+        # the paths of the files with each name, keyed by the normalized
+        # name. built from the directories when it is first needed
+        self.names = None
+
+        # the [modification time, size, digest] of each file that has
+        # been hashed, keyed by its path
+        self.hashes = {}
+
+    def refresh(self, roots):
+        # lists the directories under the roots in parallel, only listing
+        # directories again if they have been modified since they were
+        # last listed, and forgets directories that no longer exist or
+        # could not be listed in time
+
+        pool = missing.get_executor()
+        directories = {}
+        frontier = [root for root in roots if os.path.isdir(root)]
+
+        # the directories are listed a level at a time
+        while frontier:
+            futures = {
+                directory: pool.submit(missing.list_directory, directory,
+                                       self.directories.get(directory))
+                for directory in frontier if directory not in directories
+            }
+
+            frontier = []
+
+            # the workers list the level's directories in rounds, each of
+            # which may take up to the timeout
+            rounds = -(-len(futures) // config.missing_file_workers)
+            concurrent.futures.wait(
+                futures.values(), timeout=config.missing_file_timeout * rounds)
+
+            for directory, future in futures.items():
+
+                # a directory on an unresponsive share is treated like a
+                # directory that cannot be read
+                if not future.done():
+                    future.cancel()
+                    continue
+
+                listing = future.result()
+
+                if listing is not None:
+                    directories[directory] = listing
+                    frontier += [os.path.join(directory, name)
+                                 for name in listing[3]]
+
+        self.directories = directories
+        self.roots = list(roots)
+        self.names = None
+
+    def lookup(self, filepath):
+        # returns a list of the paths of files with the same name as the
+        # file, ordered from the file whose directory is most like the
+        # file's directory
+
+        if self.names is None:
+            self.names = {}
+
+            for directory, listing in self.directories.items():
+                for name in listing[2]:
+                    self.names.setdefault(os.path.normcase(name), []) \
+                        .append(os.path.join(directory, name))
+
+        candidates = self.names.get(
+            os.path.normcase(os.path.basename(filepath)), [])
+
+        parts = split_path(os.path.dirname(filepath))
+
+        return sorted(
+            candidates,
+            key=lambda candidate: shared_tail(
+                parts, split_path(os.path.dirname(candidate))),
+            reverse=True
+        )
+
+    def digest(self, filepath):
+        # returns the size and a hash of the file's contents, reusing the
+        # hash if the file has not been modified since it was hashed
+
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+
+        cached = self.hashes.get(filepath)
+
+        if cached is not None and cached[:2] == [stat.st_mtime, stat.st_size]:
+            return stat.st_size, cached[2]
+
+        file_hash = hashlib.sha1()
+
+        try:
+            with open(filepath, 'rb') as file:
+                for chunk in iter(lambda: file.read(hash_chunk_bytes), b""):
+                    file_hash.update(chunk)
+        except OSError:
+            return None
+
+        self.hashes[filepath] = \
+            [stat.st_mtime, stat.st_size, file_hash.hexdigest()]
+
+        return stat.st_size, file_hash.hexdigest()
+
+    def find(self, filepath):
+        # returns the path of the file that most likely replaces the missing
+        # file or None if there is no file or several different files that
+        # are equally likely
+
+        candidates = self.lookup(filepath)
+
+        if len(candidates) < 2:
+            return candidates[0] if candidates else None
+
+        # keep the candidates whose directories are most like the missing
+        # file's directory
+        parts = split_path(os.path.dirname(filepath))
+        best = shared_tail(parts, split_path(os.path.dirname(candidates[0])))
+        candidates = [
+            candidate for candidate in candidates
+            if shared_tail(
+                parts, split_path(os.path.dirname(candidate))) == best
+        ]
+
+        if len(candidates) == 1:
+            return candidates[0]
+
+        # the candidates are only interchangeable if they are copies of the
+        # same file, which is checked by size before it is checked by hash
+        sizes = set()
+        for candidate in candidates:
+            try:
+                sizes.add(os.path.getsize(candidate))
+            except OSError:
+                return None
+
+        if len(sizes) > 1:
+            return None
+
+        digests = set(self.digest(candidate) for candidate in candidates)
+
+        if len(digests) > 1 or None in digests:
+            return None
+
+        return candidates[0]
+
+    def save(self, filepath):
+        # writes the index to the cache file
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        with open(filepath, 'w') as file:
+            json.dump({
+                'version': cache_version,
+                'roots': self.roots,
+                'directories': {
+                    directory: [listing[0], listing[1], sorted(listing[2]),
+                                sorted(listing[3])]
+                    for directory, listing in self.directories.items()
+                },
+                'hashes': self.hashes,
+            }, file)
+
+    def load(self, filepath):
+        # reads the index from the cache file, leaving it empty if the
+        # cache file cannot be read
+
+        try:
+            with open(filepath) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if cache.get('version') != cache_version:
+            return
+
+        self.roots = cache['roots']
+        self.directories = {
+            directory: (listing[0], listing[1], frozenset(listing[2]),
+                        frozenset(listing[3]))
+            for directory, listing in cache['directories'].items()
+        }
+        self.hashes = cache['hashes']
+        self.names = None
+
+
+def split_path(path):
+    # returns the normalized components of a path
+    return os.path.normcase(os.path.normpath(path)).replace("\\", "/") \
+        .strip("/").split("/")
+
+
+def shared_tail(first, second):
+    # returns the number of trailing components two paths share
+
+    shared = 0
+
+    for first_part, second_part in zip(reversed(first), reversed(second)):
+        if first_part != second_part:
+            break
+
+        shared += 1
+
+    return shared
+
+
+def roots():
+    # returns a list of the search roots in Atomic's preferences
+    return [bpy.path.abspath(root.strip())
+            for root in config.search_roots.split(";") if root.strip()]
+
+
+def cache_path():
+    # returns the path of the cache file in Blender's config directory
+    return os.path.join(bpy.utils.user_resource('CONFIG'),
+                        "atomic_data_manager", "search_index.json")
+
+
+# the file index or None if it has not been loaded yet
+file_index = None
+
+
+def get():
+    # returns the file index, refreshed against the search roots in
+    # Atomic's preferences and saved to the cache file
+
+    global file_index
+
+    if file_index is None:
+        file_index = FileIndex()
+        file_index.load(cache_path())
+
+    file_index.refresh(roots())
+
+    try:
+        file_index.save(cache_path())
+    except OSError:
+        pass
+
+    return file_index
@@ -0,0 +1,153 @@
+"""
+Copyright (C) 2019 Remington Creative
+
+This file is part of Atomic Data Manager.
+
+Atomic Data Manager is free software: you can redistribute
+it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+Atomic Data Manager is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+This file contains a snapshot of the statistics that are shown in the
+"Stats for Nerds" panel.
+
+The panel is redrawn whenever the mouse moves over it, so instead of
+computing its statistics in draw(), the panel reads them from a snapshot
+that is computed once per data generation. The snapshot is also retaken
+after the file is saved and when the user refreshes it manually, since
+the file's size and the files it is missing can change without changing
+the data.
+
+"""
+
+import bpy
+import time
+from bpy.app.handlers import persistent
+from atomic_data_manager.stats import count
+from atomic_data_manager.stats import index
+from atomic_data_manager.stats import memory
+from atomic_data_manager.stats import misc
+from atomic_data_manager.stats import unused
+
+
+# the categories that the stats panel shows statistics for
+stats_categories = [
+    'collections',
+    'images',
+    'lights',
+    'materials',
+    'node_groups',
+    'particles',
+    'textures',
+    'worlds',
+]
+
+
+# Atomic Data Manager Stats Snapshot
+class StatsSnapshot:
+    # the statistics of the project at the moment the snapshot was taken
+
+    def __init__(self):
+        started = time.perf_counter()
+
+        # the size of the saved Blender file as a string
+        self.blend_size = misc.blend_size()
+
+        # a list of (category, bytes) tuples of how much of the saved file
+        # each category takes up, from the largest category
+        self.disk_sizes = misc.blend_category_sizes()
+
+        # the number of data-blocks in each category
+        self.totals = {}
+
+        # the number of unused data-blocks in each category
+        self.unused = {}
+
+        # the number of unnamed data-blocks in each category
+        self.unnamed = {}
+
+        # the estimated memory of each category as a string
+        self.memory = {}
+
+        for category in stats_categories:
+            self.totals[category] = getattr(count, category)()
+            self.unused[category] = \
+                getattr(count, category + "_unused")()
+            self.unnamed[category] = \
+                getattr(count, category + "_unnamed")()
+            self.memory[category] = \
+                misc.format_size(memory.total(category))
+
+        # objects have no unused data detection
+        self.totals['objects'] = count.objects()
+        self.unnamed['objects'] = count.objects_unnamed()
+
+        # the number of images with missing files
+        self.missing_images = count.images_missing()
+
+        # a list of (category, unused bytes, total bytes) tuples, from
+        # the category whose unused data would free the most memory
+        self.reclaimable = memory.reclaimable(unused.scan_categories)
+
+        # the time the snapshot was taken and how long it took in seconds
+        self.taken = time.perf_counter()
+        self.duration = self.taken - started
+
+    def age(self):
+        # returns the time in milliseconds since the snapshot was taken
+        return int((time.perf_counter() - self.taken) * 1000)
+
+
+# the latest snapshot or None if it has been invalidated
+stats_snapshot = None
+
+# the data generation that the latest snapshot was taken in
+stats_snapshot_generation = None
+
+
+def get():
+    # returns the latest snapshot, retaking it if the data has changed
+    # since it was taken or it has been invalidated
+
+    global stats_snapshot
+    global stats_snapshot_generation
+
+    if stats_snapshot is None or \
+            stats_snapshot_generation != index.generation:
+        stats_snapshot = StatsSnapshot()
+        stats_snapshot_generation = index.generation
+
+    return stats_snapshot
+
+
+def invalidate(*args):
+    # discards the latest snapshot so it is retaken on its next use
+
+    global stats_snapshot
+    stats_snapshot = None
+
+
+@persistent
+def save_handler(*args):
+    # invalidates the snapshot after the file is saved, since saving
+    # changes the size of the file
+    invalidate()
+
+
+def register():
+    bpy.app.handlers.save_post.append(save_handler)
+
+
+def unregister():
+    bpy.app.handlers.save_post.remove(save_handler)
+    invalidate()
@@ -21,97 +21,61 @@ with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
 This file contains functions that detect unnamed data-blocks in the
 Blender project.
 
+A data-block is unnamed if its name starts with one of the names Blender
+gives new data-blocks of its category or ends with a numbered suffix such
+as ".001". The checks of each category are compiled into one regular
+expression when the add-on is loaded, and every category is checked in a
+single pass whose results are cached until the data generation changes.
+
 """
 
 import bpy
 import re
-
-
-def collections():
-    # returns the keys of all unnamed collections in the project
-    unnamed = []
-
-    for collection in bpy.data.collections:
-        if re.match(r'.*\.\d\d\d$', collection.name) or \
-                collection.name.startswith("Collection"):
-            unnamed.append(collection.name)
-
-    return unnamed
-
-
-def images():
-    # returns the keys of all unnamed images in the project
-    unnamed = []
-
-    for image in bpy.data.images:
-        if re.match(r'.*\.\d\d\d$', image.name) or \
-                image.name.startswith("Untitled"):
-            unnamed.append(image.name)
-
-    return unnamed
-
-
-def lights():
-    # returns the keys of all unnamed lights in the project
-    unnamed = []
-
-    for light in bpy.data.lights:
-        if re.match(r'.*\.\d\d\d$', light.name) or \
-                light.name.startswith("Light"):
-            unnamed.append(light.name)
-
-    return unnamed
-
-
-def materials():
-    # returns the keys of all unnamed materials in the project
-    unnamed = []
-
-    for material in bpy.data.lights:
-        if re.match(r'.*\.\d\d\d$', material.name) or \
-                material.name.startswith("Material"):
-            unnamed.append(material.name)
-
-    return unnamed
-
-
-def objects():
-    # returns the keys of all unnamed materials in the project
-    # NOTE: lists of default names must be tuples!
-
-    # the default names all curve objects
-    curve_names = (
+from atomic_data_manager.stats import index
+
+
+# the names that Blender gives new data-blocks of each category
+default_names = {
+    'collections': (
+        "Collection",
+    ),
+    'images': (
+        "Untitled",
+    ),
+    'lights': (
+        "Light",
+    ),
+    'materials': (
+        "Material",
+    ),
+    'node_groups': (
+        "NodeGroup",
+    ),
+    'objects': (
+        # curve objects
         "BezierCircle",
         "BezierCurve",
         "NurbsCircle",
         "NurbsCurve",
-        "NurbsPath"
-    )
+        "NurbsPath",
 
-    # the default names of all grease pencil objects
-    gpencil_names = (
+        # grease pencil objects
         "GPencil",
-        "Stroke"
-    )
+        "Stroke",
 
-    # the default names of all light objects
-    light_names = (
+        # light objects
         "Area",
         "Light",
         "Point",
         "Spot",
-        "Sun"
-    )
+        "Sun",
 
-    # the default names of all light probe objects
-    lprobe_names = (
+        # light probe objects
         "IrradianceVolume",
         "ReflectionCubemap",
-        "ReflectionPlane"
-    )
+        "ReflectionPlane",
 
-    # the default names of all mesh objects
-    mesh_names = (
+        # mesh objects
         "Circle",
         "Cone",
         "Cube",
@@ -120,11 +84,9 @@ def objects():
         "Icosphere",
         "Plane",
         "Sphere",
-        "Torus"
-    )
+        "Torus",
 
-    # the default names of all miscellaneous objects
-    misc_names = (
+        # miscellaneous objects
         "Mball",
         "Text",
         "Armature",
@@ -132,76 +94,106 @@ def objects():
         "Empty",
         "Camera",
         "Speaker",
-        "Field"
-    )
+        "Field",
 
-    # the default names of all nurbs objects
-    nurbs_names = (
+        # nurbs objects
         "SurfCircle",
         "SurfCurve",
         "SurfPatch",
         "SurfTorus",
-        "Surface"
-    )
+        "Surface",
+    ),
+    'particles': (
+        "ParticleSettings",
+    ),
+    'textures': (
+        "Texture",
+    ),
+    'worlds': (
+        "World",
+    ),
+}
 
-    # the default names of all objects compiled into one tuple
-    default_obj_names = \
-        curve_names + gpencil_names + light_names + lprobe_names + \
-        mesh_names + misc_names + nurbs_names
 
-    unnamed = []
+def compile_pattern(names):
+    # returns a regular expression that matches names that start with one
+    # of the default names or end with a numbered suffix
+    return re.compile(r"(?:{0})|.*\.\d\d\d$".format(
+        "|".join(re.escape(name) for name in names)))
 
-    for obj in bpy.data.objects:
-        if re.match(r'.*\.\d\d\d$', obj.name) or \
-                obj.name.startswith(default_obj_names):
-            unnamed.append(obj.name)
 
-    return unnamed
+# the compiled regular expression of each category
+patterns = {category: compile_pattern(names)
+            for category, names in default_names.items()}
 
+# the keys of the unnamed data-blocks in each category
+unnamed_cache = {}
 
-def node_groups():
-    # returns the keys of all unnamed node groups in the project
-    unnamed = []
+# the data generation that the cached keys were found in
+unnamed_cache_generation = None
 
-    for node_group in bpy.data.node_groups:
-        if re.match(r'.*\.\d\d\d$', node_group.name) or \
-                node_group.name.startswith("NodeGroup"):
-            unnamed.append(node_group.name)
 
-    return unnamed
+def scan():
+    # returns a dictionary that maps each category to the keys of its
+    # unnamed data-blocks, checking every category in a single pass
 
+    global unnamed_cache_generation
 
-def particles():
-    # returns the keys of all unnamed particle systems in the project
-    unnamed = []
+    if unnamed_cache_generation == index.generation:
+        return unnamed_cache
 
-    for particle in bpy.data.particles:
-        if re.match(r'.*\.\d\d\d$', particle.name) or \
-                particle.name.startswith("ParticleSettings"):
-            unnamed.append(particle.name)
+    unnamed_cache.clear()
 
-    return unnamed
+    for category, pattern in patterns.items():
+        match = pattern.match
+        unnamed_cache[category] = [name for name in
+                                   getattr(bpy.data, category).keys()
+                                   if match(name)]
 
+    unnamed_cache_generation = index.generation
+    return unnamed_cache
 
-def textures():
-    # returns the keys of all unnamed textures in the project
-    unnamed = []
 
-    for texture in bpy.data.textures:
-        if re.match(r'.*\.\d\d\d$', texture.name) or \
-                texture.name.startswith("Texture"):
-            unnamed.append(texture.name)
+def collections():
+    # returns the keys of all unnamed collections in the project
+    return scan()['collections']
 
-    return unnamed
 
+def images():
+    # returns the keys of all unnamed images in the project
+    return scan()['images']
 
-def worlds():
-    # returns the keys of all unnamed worlds in the project
-    unnamed = []
 
-    for world in bpy.data.worlds:
-        if re.match(r'.*\.\d\d\d$', world.name) or \
-                world.name.startswith("World"):
-            unnamed.append(world.name)
+def lights():
+    # returns the keys of all unnamed lights in the project
+    return scan()['lights']
+
+
+def materials():
+    # returns the keys of all unnamed materials in the project
+    return scan()['materials']
 
-    return unnamed
\ No newline at end of file
+
+def objects():
+    # returns the keys of all unnamed objects in the project
+    return scan()['objects']
+
+
+def node_groups():
+    # returns the keys of all unnamed node groups in the project
+    return scan()['node_groups']
+
+
+def particles():
+    # returns the keys of all unnamed particle systems in the project
+    return scan()['particles']
+
+
+def textures():
+    # returns the keys of all unnamed textures in the project
+    return scan()['textures']
+
+
+def worlds():
+    # returns the keys of all unnamed worlds in the project
+    return scan()['worlds']
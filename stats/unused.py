@@ -21,41 +21,567 @@ with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
 This file contains functions that detect data-blocks that have no users,
 as determined by stats.users.py
 
+The deep functions find unused data-blocks by marking everything that can
+be reached from the project's roots in stats.index.py's reference graph
+and sweeping up whatever was not marked. Data-blocks without users and
+data-blocks that a scene links directly are settled before any marking,
+so only the remaining ambiguous data-blocks are marked, and the marking
+stops as soon as all of them are found. The shallow functions only check
+each data-block's user count, so they miss orphan cycles of data-blocks
+that only use each other.
+
 """
 
 import bpy
-from atomic_data_manager import config
-from atomic_data_manager.stats import users
+from atomic_data_manager.stats import exclusions
+from atomic_data_manager.stats import index
+from atomic_data_manager.stats import predicates
+
+
+# the categories that a scan sweeps when no categories are specified
+scan_categories = [
+    'actions',
+    'armatures',
+    'brushes',
+    'collections',
+    'curves',
+    'fonts',
+    'images',
+    'lights',
+    'materials',
+    'meshes',
+    'node_groups',
+    'particles',
+    'sounds',
+    'textures',
+    'worlds',
+]
+
+# the results of recent scans, keyed by the scanned categories and roots,
+# that remain valid until the data generation changes
+scan_cache = {}
+
+# the data generation that the cached scan results were computed in
+scan_cache_generation = None
+
+
+def roots():
+    # returns a set of the data-blocks that are in use no matter what
+    # references them: every scene, every brush in a tool's settings,
+    # the images open in the window manager's image editors and
+    # data-blocks excluded by the exclusion rules, such as data-blocks
+    # with fake users unless fake users are included in unused data
+    # detection
+
+    roots = set()
+
+    for scene in bpy.data.scenes:
+        roots.add(('scenes', scene.name))
+
+    # brushes with a user other than a fake user are in a paint or
+    # sculpt tool's settings, so they and their textures are kept
+    for brush in bpy.data.brushes:
+        if brush.users > int(brush.use_fake_user):
+            roots.add(('brushes', brush.name))
+
+    # images displayed in an image editor
+    for window_manager in bpy.data.window_managers:
+        for window in window_manager.windows:
+            for area in window.screen.areas:
+                for space in area.spaces:
+                    if getattr(space, 'image', None):
+                        roots.add(('images', space.image.name))
+
+    # data-blocks protected by the exclusion rules, which also protect
+    # the data-blocks they use
+    excluded = exclusions.unused_rules()
+
+    for category in set(index.owner_categories).union(scan_categories):
+        for datablock in getattr(bpy.data, category):
+            if excluded(datablock):
+                roots.add((category, datablock.name))
+
+    return roots
+
+
+# Atomic Data Manager Scan Result
+class ScanResult:
+    # the unused data-blocks that a single scan found in each category
+
+    def __init__(self, categories, unused, orphan_cycles):
+
+        # a list of the scanned categories
+        self.categories = list(categories)
+
+        # a dictionary that maps each scanned category to a list of keys
+        # of its unused data-blocks
+        self.unused = unused
+
+        # the orphan cycles that contain an unused data-block from one of
+        # the scanned categories
+        self.orphan_cycles = orphan_cycles
+
+    def get(self, category):
+        # returns a list of keys of unused data-blocks in the category
+        return self.unused.get(category, [])
+
+
+def scan(categories=None):
+    # returns a ScanResult with the unused data-blocks of each category,
+    # found by marking the reachable data-blocks once and sweeping every
+    # category against the same marks. results are cached until the data
+    # generation changes, so they must not be modified by the caller
+
+    steps = scan_steps(categories)
+
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def scan_steps(categories=None):
+    # a resumable scan() that yields the fraction of the work that is
+    # done after each step and returns its ScanResult when it finishes.
+    # the scan starts over if the data changes between steps
+
+    global scan_cache_generation
+
+    if categories is None:
+        categories = scan_categories
+
+    while True:
+
+        # discard results computed from an older generation of the data
+        if scan_cache_generation != index.generation:
+            scan_cache.clear()
+            scan_cache_generation = index.generation
+
+        # the roots are part of the key because opening an image in an
+        # image editor or toggling fake user detection does not change
+        # the data
+        scan_roots = roots()
+        key = (tuple(categories), frozenset(scan_roots))
+
+        if key in scan_cache:
+            return scan_cache[key]
+
+        result = yield from sweep_steps(categories, scan_roots)
+
+        if result is not None:
+            scan_cache[key] = result
+            return result
+
+
+def live():
+    # returns a set of the data-blocks that are provably in use because
+    # a scene links them directly: the scenes' worlds and collections,
+    # the objects in the scenes and the data, materials, particle systems
+    # and collections those objects use
+
+    live = set()
+
+    for scene in bpy.data.scenes:
+        if scene.world:
+            live.add(('worlds', scene.world.name))
+
+        collections = list(scene.collection.children)
+
+        while collections:
+            collection = collections.pop()
+
+            if ('collections', collection.name) not in live:
+                live.add(('collections', collection.name))
+                collections.extend(collection.children)
+
+        for obj in scene.objects:
+            live.add(('objects', obj.name))
+
+            if obj.data and obj.type in index.object_data_categories:
+                live.add(
+                    (index.object_data_categories[obj.type], obj.data.name))
+
+            if obj.instance_collection:
+                live.add(('collections', obj.instance_collection.name))
+
+            for slot in obj.material_slots:
+                if slot.material:
+                    live.add(('materials', slot.material.name))
+
+            for particle in obj.particle_systems:
+                if particle.settings:
+                    live.add(('particles', particle.settings.name))
+
+    return live
+
+
+def sweep_steps(categories, scan_roots):
+    # finds the unused data-blocks of each category in tiers, yielding the
+    # fraction of the work that is done after each step, and returns a
+    # ScanResult. data-blocks without users are unused and data-blocks
+    # that a scene links directly are used, so only the remaining
+    # ambiguous data-blocks need to be marked through the reference graph.
+    # returns None instead if the data changes between steps
+
+    start = index.generation
+    used = scan_roots | live()
+    unused = {}
+    ambiguous = {}
+
+    for category in categories:
+        unused[category] = []
+        ambiguous[category] = []
+
+        for datablock in getattr(bpy.data, category):
+            key = (category, datablock.name)
+
+            if key in used:
+                continue
+
+            # if data-block has no users or only a fake user, which
+            # has not been excluded by the exclusion rules
+            if predicates.is_unused(datablock):
+                unused[category].append(datablock.name)
+            else:
+                ambiguous[category].append(datablock.name)
+
+    targets = set()
+    for category, keys in ambiguous.items():
+        for key in keys:
+            targets.add((category, key))
+
+    yield 0.0
+
+    if index.generation != start:
+        return None
+
+    # mark the data reachable from the roots until every ambiguous
+    # data-block is marked or there is nothing left to mark
+    marked = used
+    references = None
+
+    if targets:
+
+        # the index is built so that later depsgraph updates can be
+        # patched into it and only invalidate this result if they change
+        # references. the data-blocks that the user map cannot attribute
+        # to a user are kept
+        yield from index.build_steps()
+
+        if index.generation != start:
+            return None
+
+        used = used | index.get().held
+
+        references = index.lazy_references()
+        marked = yield from index.mark_steps(used, targets, references)
+
+        if marked is None or index.generation != start:
+            return None
+
+    # unreachable data-blocks with users that the index does not know of
+    # are kept along with everything they reach. the marks are complete
+    # when a target is left unmarked, since the marking cannot stop early
+    unmarked = [target for target in targets if target not in marked]
+
+    if unmarked:
+        yield from index.build_steps()
+
+        if index.generation != start:
+            return None
+
+        unknown = unaccounted(marked)
+
+        if unknown:
+            kept = yield from index.mark_steps(unknown, unmarked, references)
+
+            if kept is None or index.generation != start:
+                return None
+
+            marked = marked | kept
+
+    for category, keys in ambiguous.items():
+        unused[category] += [key for key in keys
+                             if (category, key) not in marked]
+
+    # empty collections are unused even when they are linked to a scene
+    if 'collections' in unused:
+        unused_keys = set(unused['collections'])
+        excluded = exclusions.unused_rules()
+
+        for collection in bpy.data.collections:
+            if collection.name not in unused_keys and \
+                    not (collection.objects or collection.children) and \
+                    not excluded(collection):
+                unused['collections'].append(collection.name)
+
+    # ambiguous data-blocks that were not marked are unreachable despite
+    # having users, so they may be members of orphan cycles. the marks are
+    # complete in that case since the marking could not stop early
+    unreachable = [target for target in targets if target not in marked]
+    cycles = []
+
+    if unreachable:
+
+        # the orphan cycles that will be removed along with the unused data
+        swept = set()
+        for category, keys in unused.items():
+            for key in keys:
+                swept.add((category, key))
+
+        cycles = [cycle for cycle in
+                  orphan_cycles(marked, unreachable, references)
+                  if swept.intersection(cycle)]
+
+    return ScanResult(categories, unused, cycles)
+
+
+def unaccounted(marked):
+    # returns a set of the unmarked data-blocks that have more users than
+    # the owners in the reference index that use them. the walker may not
+    # know every kind of user yet, so such data-blocks may be in use
+
+    referrers = {}
+    for owner_references in index.get().references.values():
+        for reference in owner_references:
+            if reference not in marked:
+                referrers[reference] = referrers.get(reference, 0) + 1
+
+    unknown = set()
+
+    for category in index.category_types:
+        for datablock in getattr(bpy.data, category, ()):
+            key = (category, datablock.name)
+
+            if key not in marked and referrers.get(key, 0) < \
+                    datablock.users - int(datablock.use_fake_user):
+                unknown.add(key)
+
+    return unknown
+
+
+def orphan_cycles(marked=None, owners=None, references=None):
+    # returns a list of orphan cycles, which are groups of unreachable
+    # data-blocks that reference each other in a cycle and so keep each
+    # other's user counts above zero. each cycle is a sorted list of
+    # (category, key) tuples. if owners are specified, only the cycles
+    # that contain one of them are found
+
+    # mark the reachable data-blocks unless a scan already has
+    if marked is None:
+        marked = index.get().reachable(roots() | index.get().held)
+        marked = index.get().reachable(marked | unaccounted(marked))
+
+    if references is None:
+        references = index.lazy_references()
+
+    if owners is None:
+        owners = [owner for owner in index.get().references
+                  if owner not in marked]
+
+    def successors(owner):
+        # returns the unreachable data-blocks the owner references
+        return [reference for reference in references(owner)
+                if reference not in marked]
+
+    cycles = []
+
+    for component in index.strongly_connected_components(
+            owners, successors):
+
+        # a component is a cycle if it has more than one member or if its
+        # only member references itself
+        if len(component) > 1 or component[0] in successors(component[0]):
+            cycles.append(sorted(component))
+
+    return cycles
+
+
+def cascade(result):
+    # returns a list of the data-blocks that cleaning the scan result
+    # would leave unused, grouped by the number of removals between them
+    # and the cleaned data. each group is a sorted list of (category, key)
+    # tuples, so the first group is only used by the cleaned data, the
+    # second group is only used by the first group and so on
+
+    steps = cascade_steps(result)
+
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def cascade_steps(result):
+    # a resumable cascade() that yields the fraction of the work that is
+    # done after each step and returns the grouped data-blocks when it
+    # finishes. the search starts over if the data changes between steps
+
+    while True:
+        yield from index.build_steps()
+
+        start = index.generation
+        reference_index = index.get()
+        references = reference_index.references
+
+        # the data-blocks that cleaning the scan result removes
+        removed = set()
+        for category, keys in result.unused.items():
+            for key in keys:
+                removed.add((category, key))
+
+        for cycle in result.orphan_cycles:
+            removed.update(cycle)
+
+        # the data-blocks that the removed data-blocks reference, directly
+        # or through each other, which cleaning could leave unused
+        referenced = set()
+        stack = list(removed)
+
+        while stack:
+            for reference in references.get(stack.pop(), ()):
+                if reference[0] in scan_categories and \
+                        reference not in removed and \
+                        reference not in referenced:
+                    referenced.add(reference)
+                    stack.append(reference)
+
+        # the candidates are the referenced data-blocks that cannot be
+        # reached from the roots. a referenced data-block that can only
+        # be reached through a marked one is marked as well, so the marks
+        # are complete for the referenced data-blocks even if the marking
+        # stops early
+        marked = yield from index.mark_steps(
+            roots() | reference_index.held, referenced,
+            index.lazy_references())
+
+        if marked is None or index.generation != start:
+            continue
+
+        candidates = referenced - marked
+
+        # the owners that use each candidate directly
+        users = {candidate: [] for candidate in candidates}
+        for owner, owner_references in references.items():
+            for reference in owner_references:
+                if reference in users:
+                    users[reference].append(owner)
+
+        # drop every candidate that a data-block that is kept or a user
+        # that the index does not know of uses, then the candidates that
+        # each dropped candidate uses in turn, until the remaining
+        # candidates are only used by each other and the removed data
+        unknown = unaccounted(marked)
+        stack = [candidate for candidate in candidates
+                 if candidate in unknown or
+                 any(user not in removed and user not in candidates
+                     for user in users[candidate])]
+        candidates.difference_update(stack)
+
+        while stack:
+            for reference in references.get(stack.pop(), ()):
+                if reference in candidates:
+                    candidates.discard(reference)
+                    stack.append(reference)
+
+        # group the candidates by how far they are from the removed data
+        depths = []
+        reached = set(removed)
+        frontier = removed
+
+        while frontier:
+            following = set()
+
+            for owner in frontier:
+                for reference in references.get(owner, ()):
+                    if reference in candidates and \
+                            reference not in reached:
+                        following.add(reference)
+
+            if following:
+                depths.append(sorted(following))
+
+            reached.update(following)
+            frontier = following
+
+        return depths
+
+
+def clean_steps(categories, recursive):
+    # a resumable scan of the categories that yields the fraction of the
+    # work that is done after each step. a recursive purge also finds the
+    # data-blocks that cleaning would leave unused, as the second half of
+    # the work. returns a tuple of the ScanResult and the cascade, which
+    # is None unless the purge is recursive
+
+    if not recursive:
+        result = yield from scan_steps(categories)
+        return result, None
+
+    steps = scan_steps(categories)
+    while True:
+        try:
+            yield next(steps) / 2
+        except StopIteration as stop:
+            result = stop.value
+            break
+
+    steps = cascade_steps(result)
+    while True:
+        try:
+            yield 0.5 + next(steps) / 2
+        except StopIteration as stop:
+            return result, stop.value
 
 
 def shallow(data):
     # returns a list of keys of unused data-blocks in the data that may be
     # incomplete, but is significantly faster than doing a deep search
 
-    unused = []
+    return predicates.shallow(data, exclusions.unused_rules())
 
-    for datablock in data:
 
-        # if data-block has no users or if it has a fake user and
-        # ignore fake users is enabled
-        if datablock.users == 0 or (datablock.users == 1 and
-                                    datablock.use_fake_user and
-                                    config.include_fake_users):
-            unused.append(datablock.name)
+def actions_deep():
+    # returns a list of keys of unused actions
+    return scan(['actions']).get('actions')
 
-    return unused
 
+def actions_shallow():
+    # returns a list of keys of unused actions that may be
+    # incomplete, but is significantly faster than doing a deep search
 
-def collections_deep():
-    # returns a full list of keys of unused collections
+    return shallow(bpy.data.actions)
 
-    unused = []
 
-    for collection in bpy.data.collections:
-        if not users.collection_all(collection.name):
-            unused.append(collection.name)
+def armatures_deep():
+    # returns a list of keys of unused armatures
+    return scan(['armatures']).get('armatures')
 
-    return unused
+
+def armatures_shallow():
+    # returns a list of keys of unused armatures that may be
+    # incomplete, but is significantly faster than doing a deep search
+
+    return shallow(bpy.data.armatures)
+
+
+def brushes_deep():
+    # returns a list of keys of unused brushes
+    return scan(['brushes']).get('brushes')
+
+
+def brushes_shallow():
+    # returns a list of keys of unused brushes that may be
+    # incomplete, but is significantly faster than doing a deep search
+
+    return shallow(bpy.data.brushes)
+
+
+def collections_deep():
+    # returns a full list of keys of unused collections
+    return scan(['collections']).get('collections')
 
 
 def collections_shallow():
@@ -63,69 +589,58 @@ def collections_shallow():
     # incomplete, but is significantly faster.
 
     unused = []
+    excluded = exclusions.unused_rules()
 
     for collection in bpy.data.collections:
-        if not (collection.objects or collection.children):
+
+        # if the collection is empty and it is not excluded by the
+        # exclusion rules
+        if not (collection.objects or collection.children) and \
+                not excluded(collection):
             unused.append(collection.name)
 
     return unused
 
 
-def images_deep():
-    # returns a full list of keys of unused images
-
-    unused = []
+def curves_deep():
+    # returns a list of keys of unused curves
+    return scan(['curves']).get('curves')
 
-    # a list of image keys that should not be flagged as unused
-    # this list also exists in images_shallow()
-    do_not_flag = ["Render Result", "Viewer Node", "D-NOISE Export"]
 
-    for image in bpy.data.images:
-        if not users.image_all(image.name):
+def curves_shallow():
+    # returns a list of keys of unused curves that may be
+    # incomplete, but is significantly faster than doing a deep search
 
-            # check if image has a fake user or if ignore fake users
-            # is enabled
-            if not image.use_fake_user or config.include_fake_users:
+    return shallow(bpy.data.curves)
 
-                # if image is not in our do not flag list
-                if image.name not in do_not_flag:
-                    unused.append(image.name)
 
-    return unused
+def fonts_deep():
+    # returns a list of keys of unused fonts
+    return scan(['fonts']).get('fonts')
 
 
-def images_shallow():
-    # returns a list of keys of unused images that may be
+def fonts_shallow():
+    # returns a list of keys of unused fonts that may be
     # incomplete, but is significantly faster than doing a deep search
 
-    unused_images = shallow(bpy.data.images)
-
-    # a list of image keys that should not be flagged as unused
-    # this list also exists in images_deep()
-    do_not_flag = ["Render Result", "Viewer Node", "D-NOISE Export"]
+    return shallow(bpy.data.fonts)
 
-    # remove do not flag keys from unused images
-    for key in do_not_flag:
-        if key in unused_images:
-            unused_images.remove(key)
-
-    return unused_images
 
+def images_deep():
+    # returns a full list of keys of unused images
+    return scan(['images']).get('images')
 
-def lights_deep():
-    # returns a list of keys of unused lights
 
-    unused = []
+def images_shallow():
+    # returns a list of keys of unused images that may be
+    # incomplete, but is significantly faster than doing a deep search
 
-    for light in bpy.data.lights:
-        if not users.light_all(light.name):
+    return shallow(bpy.data.images)
 
-            # check if light has a fake user or if ignore fake users
-            # is enabled
-            if not light.use_fake_user or config.include_fake_users:
-                unused.append(light.name)
 
-    return unused
+def lights_deep():
+    # returns a list of keys of unused lights
+    return scan(['lights']).get('lights')
 
 
 def lights_shallow():
@@ -137,18 +652,7 @@ def lights_shallow():
 
 def materials_deep():
     # returns a list of keys of unused materials
-
-    unused = []
-
-    for material in bpy.data.materials:
-        if not users.material_all(material.name):
-
-            # check if material has a fake user or if ignore fake users
-            # is enabled
-            if not material.use_fake_user or config.include_fake_users:
-                unused.append(material.name)
-
-    return unused
+    return scan(['materials']).get('materials')
 
 
 def materials_shallow():
@@ -158,20 +662,21 @@ def materials_shallow():
     return shallow(bpy.data.materials)
 
 
-def node_groups_deep():
-    # returns a list of keys of unused node_groups
+def meshes_deep():
+    # returns a list of keys of unused meshes
+    return scan(['meshes']).get('meshes')
 
-    unused = []
 
-    for node_group in bpy.data.node_groups:
-        if not users.node_group_all(node_group.name):
+def meshes_shallow():
+    # returns a list of keys of unused meshes that may be
+    # incomplete, but is significantly faster than doing a deep search
 
-            # check if node group has a fake user or if ignore fake users
-            # is enabled
-            if not node_group.use_fake_user or config.include_fake_users:
-                unused.append(node_group.name)
+    return shallow(bpy.data.meshes)
 
-    return unused
+
+def node_groups_deep():
+    # returns a list of keys of unused node_groups
+    return scan(['node_groups']).get('node_groups')
 
 
 def node_groups_shallow():
@@ -183,18 +688,7 @@ def node_groups_shallow():
 
 def particles_deep():
     # returns a list of keys of unused particle systems
-
-    unused = []
-
-    for particle in bpy.data.particles:
-        if not users.particle_all(particle.name):
-
-            # check if particle system has a fake user or if ignore fake
-            # users is enabled
-            if not particle.use_fake_user or config.include_fake_users:
-                unused.append(particle.name)
-
-    return unused
+    return scan(['particles']).get('particles')
 
 
 def particles_shallow():
@@ -204,20 +698,21 @@ def particles_shallow():
     return shallow(bpy.data.particles)
 
 
-def textures_deep():
-    # returns a list of keys of unused textures
+def sounds_deep():
+    # returns a list of keys of unused sounds
+    return scan(['sounds']).get('sounds')
 
-    unused = []
 
-    for texture in bpy.data.textures:
-        if not users.texture_all(texture.name):
+def sounds_shallow():
+    # returns a list of keys of unused sounds that may be
+    # incomplete, but is significantly faster than doing a deep search
+
+    return shallow(bpy.data.sounds)
 
-            # check if texture has a fake user or if ignore fake users
-            # is enabled
-            if not texture.use_fake_user or config.include_fake_users:
-                unused.append(texture.name)
 
-    return unused
+def textures_deep():
+    # returns a list of keys of unused textures
+    return scan(['textures']).get('textures')
 
 
 def textures_shallow():
@@ -229,16 +724,4 @@ def textures_shallow():
 
 def worlds():
     # returns a full list of keys of unused worlds
-
-    unused = []
-
-    for world in bpy.data.worlds:
-
-        # if data-block has no users or if it has a fake user and
-        # ignore fake users is enabled
-        if world.users == 0 or (world.users == 1 and
-                                world.use_fake_user and
-                                config.include_fake_users):
-            unused.append(world.name)
-
-    return unused
+    return shallow(bpy.data.worlds)
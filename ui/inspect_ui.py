@@ -25,6 +25,8 @@ This file contains the inspection user interface.
 import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
+from atomic_data_manager.stats import background
+from atomic_data_manager.stats import index
 from atomic_data_manager.stats import users
 from atomic_data_manager.ui.utils import ui_layouts
 
@@ -140,6 +142,12 @@ class ATOMIC_OT_inspect_collections(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "COLLECTIONS"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
@@ -251,6 +259,12 @@ class ATOMIC_OT_inspect_images(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "IMAGES"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
@@ -311,6 +325,12 @@ class ATOMIC_OT_inspect_lights(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "LIGHTS"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
@@ -373,6 +393,12 @@ class ATOMIC_OT_inspect_materials(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "MATERIALS"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
@@ -485,6 +511,12 @@ class ATOMIC_OT_inspect_node_groups(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "NODE_GROUPS"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
@@ -549,6 +581,12 @@ class ATOMIC_OT_inspect_particles(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "PARTICLES"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
@@ -648,6 +686,12 @@ class ATOMIC_OT_inspect_textures(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "TEXTURES"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
@@ -691,6 +735,12 @@ class ATOMIC_OT_inspect_worlds(bpy.types.Operator):
         atom = bpy.context.scene.atomic
         atom.active_inspection = "WORLDS"
 
+        # build the reference index in the background if it takes too
+        # long, in which case the dialog is invoked again when it finishes
+        if not background.run(
+                context, self.bl_idname, index.build_steps()):
+            return {'CANCELLED'}
+
         # trigger update on invoke
         global inspection_update_trigger
         inspection_update_trigger = True
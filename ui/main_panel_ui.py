@@ -29,6 +29,7 @@ category toggles and the category selection tools.
 import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
+from atomic_data_manager.stats import background
 from atomic_data_manager.stats import count
 from atomic_data_manager.ui.utils import ui_layouts
 
@@ -45,12 +46,19 @@ class ATOMIC_PT_main_panel(bpy.types.Panel):
         layout = self.layout
         atom = bpy.context.scene.atomic
         category_props = [
+            atom.actions,
+            atom.armatures,
+            atom.brushes,
             atom.collections,
+            atom.curves,
+            atom.fonts,
             atom.images,
             atom.lights,
             atom.materials,
+            atom.meshes,
             atom.node_groups,
             atom.particles,
+            atom.sounds,
             atom.textures,
             atom.worlds
         ]
@@ -62,6 +70,23 @@ class ATOMIC_PT_main_panel(bpy.types.Panel):
         row.operator("atomic.clean", text="Clean", icon="PARTICLEMODE")
         row.operator("atomic.undo", text="Undo", icon="LOOP_BACK")
 
+        # background scan progress and cancel button
+        progress = background.progress()
+
+        if progress is not None:
+            row = layout.row(align=True)
+
+            row.label(
+                text="Scanning... {0}%".format(int(progress * 100)),
+                icon='TIME'
+            )
+
+            row.operator(
+                "atomic.cancel_scan",
+                icon='CANCEL',
+                text=""
+            )
+
         row = layout.row()
 
         # category toggles
@@ -208,6 +233,78 @@ class ATOMIC_PT_main_panel(bpy.types.Panel):
             text=""
         )
 
+        # category toggles for data that cannot be inspected
+        split = layout.split(align=False)
+
+        # left column
+        col = split.column(align=True)
+
+        # actions toggle
+        col.prop(
+            atom,
+            "actions",
+            text="Actions",
+            icon='ACTION',
+            toggle=True
+        )
+
+        # armatures toggle
+        col.prop(
+            atom,
+            "armatures",
+            text="Armatures",
+            icon='ARMATURE_DATA',
+            toggle=True
+        )
+
+        # brushes toggle
+        col.prop(
+            atom,
+            "brushes",
+            text="Brushes",
+            icon='BRUSH_DATA',
+            toggle=True
+        )
+
+        # curves toggle
+        col.prop(
+            atom,
+            "curves",
+            text="Curves",
+            icon='CURVE_DATA',
+            toggle=True
+        )
+
+        # right column
+        col = split.column(align=True)
+
+        # fonts toggle
+        col.prop(
+            atom,
+            "fonts",
+            text="Fonts",
+            icon='FONT_DATA',
+            toggle=True
+        )
+
+        # meshes toggle
+        col.prop(
+            atom,
+            "meshes",
+            text="Meshes",
+            icon='MESH_DATA',
+            toggle=True
+        )
+
+        # sounds toggle
+        col.prop(
+            atom,
+            "sounds",
+            text="Sounds",
+            icon='SOUND',
+            toggle=True
+        )
+
         # selection operators
         row = layout.row(align=True)
 
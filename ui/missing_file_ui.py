@@ -21,6 +21,10 @@ with Atomic Data Manager.  If not, see <https://www.gnu.org/licenses/>.
 This file contains the user interface for the missing file dialog that
 pops up when missing files are detected on file load.
 
+Missing files are detected in a background thread after a file is
+loaded, so opening a file never waits on network shares. A timer polls
+the detection, and the dialog pops up with its results once it finishes.
+
 """
 
 import bpy
@@ -29,6 +33,7 @@ from bpy.utils import unregister_class
 from bpy.app.handlers import persistent
 from atomic_data_manager import config
 from atomic_data_manager.stats import missing
+from atomic_data_manager.stats import background
 from atomic_data_manager.ui.utils import ui_layouts
 
 
@@ -152,9 +157,16 @@ class ATOMIC_OT_detect_missing(bpy.types.Operator):
 
     def invoke(self, context, event):
 
-        # update missing file lists
-        self.missing_images = missing.images()
-        self.missing_libraries = missing.libraries()
+        # use the results of the detection that popped up the dialog, or
+        # update missing file lists from fresh directory listings
+        detected = missing.take_detected()
+
+        if detected is not None:
+            self.missing_images, self.missing_libraries = detected
+        else:
+            missing.clear_cache()
+            self.missing_images = missing.images()
+            self.missing_libraries = missing.libraries()
 
         wm = context.window_manager
 
@@ -167,13 +179,53 @@ class ATOMIC_OT_detect_missing(bpy.types.Operator):
             return wm.invoke_popup(self, width=300)
 
 
+# the time in seconds between checks of whether the detection finished
+poll_interval = 0.2
+
+
+def poll_missing_files():
+    # invokes the detect missing popup once the background detection
+    # finds missing files and returns the time until the next check or
+    # None to stop the timer
+
+    if not missing.poll_detection():
+        return poll_interval if missing.detection is not None else None
+
+    images, libraries = missing.detected
+
+    if not (images or libraries):
+        missing.take_detected()
+        return None
+
+    # timers run without a window, so the popup is shown in the first one
+    windows = bpy.context.window_manager.windows
+
+    if windows:
+        window = windows[0]
+        background.invoke_with_override(
+            bpy.ops.atomic.detect_missing,
+            {'window': window, 'screen': window.screen}
+        )
+
+    return None
+
+
 @persistent
 def autodetect_missing_files(dummy=None):
-    # invokes the detect missing popup when missing files are detected upon
-    # loading a new Blender project
-    if config.enable_missing_file_warning and \
-            (missing.images() or missing.libraries()):
-        bpy.ops.atomic.detect_missing('INVOKE_DEFAULT')
+    # starts detecting missing files in the background upon loading a new
+    # Blender project
+    if config.enable_missing_file_warning:
+        missing.start_detection()
+
+        if not bpy.app.timers.is_registered(poll_missing_files):
+            bpy.app.timers.register(
+                poll_missing_files, first_interval=poll_interval)
+
+
+@persistent
+def cancel_missing_files(dummy=None):
+    # discards the detection of the previous file before loading a new one
+    missing.cancel_detection()
 
 
 reg_list = [ATOMIC_OT_detect_missing]
@@ -184,6 +236,7 @@ def register():
         register_class(item)
 
     # run missing file auto-detection after loading a Blender file
+    bpy.app.handlers.load_pre.append(cancel_missing_files)
     bpy.app.handlers.load_post.append(autodetect_missing_files)
 
 
@@ -192,4 +245,10 @@ def unregister():
         unregister_class(item)
 
     # stop running missing file auto-detection after loading a Blender file
+    bpy.app.handlers.load_pre.remove(cancel_missing_files)
     bpy.app.handlers.load_post.remove(autodetect_missing_files)
+
+    if bpy.app.timers.is_registered(poll_missing_files):
+        bpy.app.timers.unregister(poll_missing_files)
+
+    missing.cancel_detection()
@@ -27,6 +27,7 @@ import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
 from atomic_data_manager import config
+from atomic_data_manager.stats import index
 from atomic_data_manager.updater import addon_updater_ops
 
 
@@ -69,6 +70,27 @@ def copy_prefs_to_config(self, context):
     config.include_fake_users = \
         atomic_preferences.include_fake_users
 
+    config.user_graph_backend = \
+        atomic_preferences.user_graph_backend
+
+    config.exclude_prefixes = \
+        atomic_preferences.exclude_prefixes
+
+    config.exclude_linked_data = \
+        atomic_preferences.exclude_linked_data
+
+    config.exclude_tagged_data = \
+        atomic_preferences.exclude_tagged_data
+
+    config.missing_file_workers = \
+        atomic_preferences.missing_file_workers
+
+    config.missing_file_timeout = \
+        atomic_preferences.missing_file_timeout
+
+    config.search_roots = \
+        atomic_preferences.search_roots
+
     # hidden atomic preferences
     config.pie_menu_type = \
         atomic_preferences.pie_menu_type
@@ -92,6 +114,13 @@ def copy_prefs_to_config(self, context):
         atomic_preferences.last_popup_day
 
 
+def update_user_graph_backend(self, context):
+    # copies the new backend to config.py and discards the reference index
+    # so it is rebuilt with the new backend
+    copy_prefs_to_config(self, context)
+    index.invalidate()
+
+
 def update_pie_menu_hotkeys(self, context):
     preferences = bpy.context.preferences
     atomic_preferences = preferences.addons['atomic_data_manager'] \
@@ -179,6 +208,68 @@ class ATOMIC_PT_preferences_panel(bpy.types.AddonPreferences):
         default=False
     )
 
+    user_graph_backend: bpy.props.EnumProperty(
+        items=[
+            (
+                'ATOMIC',
+                'Atomic Walker',
+                'Find data-block users by walking node trees, material '
+                'slots and modifiers in Python'
+            ),
+            (
+                'NATIVE',
+                'Native User Map',
+                'Find data-block users with Blender\'s built-in user map, '
+                'which is faster on large projects'
+            )
+        ],
+        description="The method Atomic uses to find the users of "
+                    "data-blocks",
+        default='ATOMIC',
+        update=update_user_graph_backend
+    )
+
+    exclude_prefixes: bpy.props.StringProperty(
+        description="Comma-separated name prefixes of data-blocks that "
+                    "Atomic should never flag as unused or missing",
+        default=""
+    )
+
+    exclude_linked_data: bpy.props.BoolProperty(
+        description="Never flag data-blocks linked from other files as "
+                    "unused",
+        default=False
+    )
+
+    exclude_tagged_data: bpy.props.BoolProperty(
+        description="Never flag assets or data-blocks with an "
+                    "\"atomic_exclude\" custom property as unused or "
+                    "missing",
+        default=True
+    )
+
+    missing_file_workers: bpy.props.IntProperty(
+        description="The number of files Atomic checks for at the same "
+                    "time when detecting missing files",
+        default=8,
+        min=1,
+        max=64
+    )
+
+    missing_file_timeout: bpy.props.FloatProperty(
+        description="The seconds Atomic waits for each file when "
+                    "detecting missing files before skipping it",
+        default=2.0,
+        min=0.1,
+        max=60.0
+    )
+
+    search_roots: bpy.props.StringProperty(
+        description="Semicolon-separated directories that Atomic "
+                    "searches for missing files",
+        default=""
+    )
+
     enable_pie_menu_ui: bpy.props.BoolProperty(
         description="Enable the Atomic pie menu UI, so you can clean "
                     "your project from anywhere.",
@@ -272,6 +363,48 @@ class ATOMIC_PT_preferences_panel(bpy.types.AddonPreferences):
             text="Show \"Support Me\" Popup"
         )
 
+        # exclude linked data toggle
+        col.prop(
+            self,
+            "exclude_linked_data",
+            text="Exclude Linked Data"
+        )
+
+        # exclude tagged data toggle
+        col.prop(
+            self,
+            "exclude_tagged_data",
+            text="Exclude Tagged Data"
+        )
+
+        # excluded name prefixes field
+        col.prop(
+            self,
+            "exclude_prefixes",
+            text="Exclude Prefixes"
+        )
+
+        # missing file check workers field
+        col.prop(
+            self,
+            "missing_file_workers",
+            text="Missing File Workers"
+        )
+
+        # missing file check timeout field
+        col.prop(
+            self,
+            "missing_file_timeout",
+            text="Missing File Timeout"
+        )
+
+        # missing file search roots field
+        col.prop(
+            self,
+            "search_roots",
+            text="Search Roots"
+        )
+
         # right column
         col = split.column()
 
@@ -282,6 +415,15 @@ class ATOMIC_PT_preferences_panel(bpy.types.AddonPreferences):
             text="Include Fake Users"
         )
 
+        # user graph backend selector and consistency check
+        backend_row = col.row(align=True)
+        backend_row.prop(self, "user_graph_backend", text="")
+        backend_row.operator(
+            "atomic.check_user_graph",
+            text="",
+            icon="VIEWZOOM"
+        )
+
         # pie menu settings
         pie_split = col.split(factor=0.55)  # nice
 
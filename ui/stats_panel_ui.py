@@ -29,11 +29,31 @@ it.
 import bpy
 from bpy.utils import register_class
 from bpy.utils import unregister_class
-from atomic_data_manager.stats import count
 from atomic_data_manager.stats import misc
+from atomic_data_manager.stats import snapshot
 from atomic_data_manager.ui.utils import ui_layouts
 
 
+# the titles of the categories in the memory statistics
+category_titles = {
+    'actions': "Actions",
+    'armatures': "Armatures",
+    'brushes': "Brushes",
+    'collections': "Collections",
+    'curves': "Curves",
+    'fonts': "Fonts",
+    'images': "Images",
+    'lights': "Lights",
+    'materials': "Materials",
+    'meshes': "Meshes",
+    'node_groups': "Node Groups",
+    'particles': "Particle Systems",
+    'sounds': "Sounds",
+    'textures': "Textures",
+    'worlds': "Worlds",
+}
+
+
 # Atomic Data Manager Statistics SubPanel
 class ATOMIC_PT_stats_panel(bpy.types.Panel):
     """The Atomic Data Manager \"Stats for Nerds\" panel"""
@@ -47,6 +67,15 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
         layout = self.layout
         atom = bpy.context.scene.atomic
 
+        # the statistics are read from a snapshot instead of computed on
+        # every redraw
+        stats = snapshot.get()
+
+        # snapshot age and refresh button
+        row = layout.row()
+        row.label(text="Computed {0} ms ago".format(stats.age()))
+        row.operator("atomic.refresh_stats", text="", icon='FILE_REFRESH')
+
         # categories selector / header
         row = layout.row()
         row.label(text="Categories:")
@@ -64,7 +93,7 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
 
             # blender project file size statistic
             row = box.row()
-            row.label(text="Blend File Size:     " + misc.blend_size())
+            row.label(text="Blend File Size:     " + stats.blend_size)
 
             # cateogry statistics
             split = box.split()
@@ -81,16 +110,16 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             # collection count
-            col.label(text=str(count.collections()))
+            col.label(text=str(stats.totals['collections']))
 
             # light count
-            col.label(text=str(count.lights()))
+            col.label(text=str(stats.totals['lights']))
 
             # node group count
-            col.label(text=str(count.node_groups()))
+            col.label(text=str(stats.totals['node_groups']))
 
             # texture count
-            col.label(text=str(count.textures()))
+            col.label(text=str(stats.totals['textures']))
 
             # right column
             col = split.column()
@@ -104,16 +133,47 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             # image count
-            col.label(text=str(count.images()))
+            col.label(text=str(stats.totals['images']))
 
             # material count
-            col.label(text=str(count.materials()))
+            col.label(text=str(stats.totals['materials']))
 
             # particle system count
-            col.label(text=str(count.particles()))
+            col.label(text=str(stats.totals['particles']))
 
             # world count
-            col.label(text=str(count.worlds()))
+            col.label(text=str(stats.totals['worlds']))
+
+            # how much of the saved file each category takes up, from the
+            # category that takes up the most
+            if stats.disk_sizes:
+                row = box.row()
+                row.label(text="Blend File Size by Category")
+
+                split = box.split()
+                titles = split.column()
+                sizes = split.column()
+
+                for category, size_bytes in stats.disk_sizes:
+                    titles.label(text=category_titles.get(
+                        category, category.replace("_", " ").title()))
+                    sizes.label(text=misc.format_size(size_bytes))
+
+            # estimated memory of each category and the memory its unused
+            # data would free, from the category that would free the most
+            row = box.row()
+            row.label(text="Estimated Memory (Unused / Total)")
+
+            split = box.split()
+            titles = split.column()
+            estimates = split.column()
+
+            for category, unused_bytes, total_bytes in stats.reclaimable:
+                titles.label(text=category_titles[category])
+                estimates.label(text="{0} / {1}".format(
+                    misc.format_size(unused_bytes),
+                    misc.format_size(total_bytes)
+                ))
 
         # collection statistics
         elif atom.stats_mode == 'COLLECTIONS':
@@ -128,20 +188,22 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.collections())
+                text="Total: {0}".format(stats.totals['collections'])
             )
 
-            # col.label(text="Placeholder")  # TODO: remove placeholder
+            col.label(
+                text="Memory: {0}".format(stats.memory['collections'])
+            )
 
             # unused and unnamed count
             col = split.column()
 
             col.label(
-                text="Unused: {0}".format(count.collections_unused())
+                text="Unused: {0}".format(stats.unused['collections'])
             )
 
             col.label(
-                text="Unnamed: {0}".format(count.collections_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['collections'])
             )
 
         # image statistics
@@ -157,21 +219,25 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.images())
+                text="Total: {0}".format(stats.totals['images'])
             )
 
             col.label(
-                text="Missing: {0}".format(count.images_missing())
+                text="Missing: {0}".format(stats.missing_images)
+            )
+
+            col.label(
+                text="Memory: {0}".format(stats.memory['images'])
             )
 
             # unused and unnamed count
             col = split.column()
 
             col.label(
-                text="Unused: {0}".format(count.images_unused())
+                text="Unused: {0}".format(stats.unused['images'])
             )
             col.label(
-                text="Unnamed: {0}".format(count.images_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['images'])
             )
 
         # light statistics
@@ -185,20 +251,22 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.lights())
+                text="Total: {0}".format(stats.totals['lights'])
             )
 
-            # col.label(text="Placeholder")  # TODO: remove placeholder
+            col.label(
+                text="Memory: {0}".format(stats.memory['lights'])
+            )
 
             # unused and unnamed count
             col = split.column()
 
             col.label(
-                text="Unused: {0}".format(count.lights_unused())
+                text="Unused: {0}".format(stats.unused['lights'])
             )
 
             col.label(
-                text="Unnamed: {0}".format(count.lights_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['lights'])
             )
 
         # material statistics
@@ -214,20 +282,22 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.materials())
+                text="Total: {0}".format(stats.totals['materials'])
             )
 
-            # col.label(text="Placeholder")  # TODO: remove placeholder
+            col.label(
+                text="Memory: {0}".format(stats.memory['materials'])
+            )
 
             # unused and unnamed count
             col = split.column()
 
             col.label(
-                text="Unused: {0}".format(count.materials_unused())
+                text="Unused: {0}".format(stats.unused['materials'])
             )
 
             col.label(
-                text="Unnamed: {0}".format(count.materials_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['materials'])
             )
 
         # object statistics
@@ -242,14 +312,14 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.objects())
+                text="Total: {0}".format(stats.totals['objects'])
             )
 
             # unnamed count
             col = split.column()
 
             col.label(
-                text="Unnamed: {0}".format(count.objects_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['objects'])
             )
 
         # node group statistics
@@ -265,18 +335,20 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.node_groups())
+                text="Total: {0}".format(stats.totals['node_groups'])
             )
 
-            # col.label(text="Placeholder")  # TODO: remove placeholder
+            col.label(
+                text="Memory: {0}".format(stats.memory['node_groups'])
+            )
 
             # unused and unnamed count
             col = split.column()
             col.label(
-                text="Unused: {0}".format(count.node_groups_unused())
+                text="Unused: {0}".format(stats.unused['node_groups'])
             )
             col.label(
-                text="Unnamed: {0}".format(count.node_groups_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['node_groups'])
             )
 
         # particle statistics
@@ -292,20 +364,22 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.particles())
+                text="Total: {0}".format(stats.totals['particles'])
             )
 
-            # col.label(text="Placeholder")  # TODO: remove placeholder
+            col.label(
+                text="Memory: {0}".format(stats.memory['particles'])
+            )
 
             # unused and unnamed count
             col = split.column()
 
             col.label(
-                text="Unused: {0}".format(count.particles_unused())
+                text="Unused: {0}".format(stats.unused['particles'])
             )
 
             col.label(
-                text="Unnamed: {0}".format(count.particles_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['particles'])
             )
 
         # texture statistics
@@ -319,20 +393,22 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.textures())
+                text="Total: {0}".format(stats.totals['textures'])
             )
 
-            # col.label(text="Placeholder")  # TODO: remove placeholder
+            col.label(
+                text="Memory: {0}".format(stats.memory['textures'])
+            )
 
             # unused and unnamed count
             col = split.column()
 
             col.label(
-                text="Unused: {0}".format(count.textures_unused())
+                text="Unused: {0}".format(stats.unused['textures'])
             )
 
             col.label(
-                text="Unnamed: {0}".format(count.textures_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['textures'])
             )
 
         # world statistics
@@ -346,20 +422,22 @@ class ATOMIC_PT_stats_panel(bpy.types.Panel):
             col = split.column()
 
             col.label(
-                text="Total: {0}".format(count.worlds())
+                text="Total: {0}".format(stats.totals['worlds'])
             )
 
-            # # col.label(text="Placeholder")  # TODO: remove placeholder
+            col.label(
+                text="Memory: {0}".format(stats.memory['worlds'])
+            )
 
             # unused and unnamed count
             col = split.column()
 
             col.label(
-                text="Unused: {0}".format(count.worlds_unused())
+                text="Unused: {0}".format(stats.unused['worlds'])
             )
 
             col.label(
-                text="Unnamed: {0}".format(count.worlds_unnamed())
+                text="Unnamed: {0}".format(stats.unnamed['worlds'])
             )
 
 